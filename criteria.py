@@ -1045,15 +1045,27 @@ CRITERIA: list[dict] = [
 ]
 
 
+# Índices por sección y por id, armados una sola vez: las páginas los
+# consultan en cada rerun de Streamlit.
+_CRITERIA_BY_SECTION: dict[str, list[dict]] = {}
+for _c in CRITERIA:
+    _CRITERIA_BY_SECTION.setdefault(_c["section"], []).append(_c)
+del _c
+
+_CRITERIA_BY_ID: dict[str, dict] = {c["id"]: c for c in CRITERIA}
+
+# Etiquetas "A.1 — Nombre…" para selectores de ítem, y posición de cada estado
+# de desvío (para el `index=` de los selectbox sin recorrer la lista).
+ITEM_LABELS: dict[str, str] = {c["id"]: f"{c['id']} — {c['name'][:60]}" for c in CRITERIA}
+ESTADO_DESVIO_IDX: dict[str, int] = {e: i for i, e in enumerate(ESTADOS_DESVIO)}
+
+
 def get_criteria_by_section(section: str) -> list[dict]:
-    return [c for c in CRITERIA if c["section"] == section]
+    return list(_CRITERIA_BY_SECTION.get(section, ()))
 
 
 def get_criterion_by_id(criterion_id: str) -> dict | None:
-    for c in CRITERIA:
-        if c["id"] == criterion_id:
-            return c
-    return None
+    return _CRITERIA_BY_ID.get(criterion_id)
 
 
 def get_section_name(section: str) -> str:
@@ -10,12 +10,15 @@ Colecciones:
 from __future__ import annotations
 
 import os
+from collections.abc import Iterator
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
 import streamlit as st
 
+from criteria import PRIORIDADES
+
 
 def _get_uri() -> str | None:
     try:
@@ -67,8 +70,41 @@ def save_photo(
     item_id: str,
     photo_data: bytes,
     photo_name: str,
+    thumb_data: bytes | None = None,
 ) -> str:
     """Save a compressed photo. Returns the inserted document ID as string."""
+    doc = _photo_doc(local, fecha, section, item_id, photo_data, photo_name, thumb_data)
+    result = _col().insert_one(doc)
+    return str(result.inserted_id)
+
+
+def save_photos(
+    local: str,
+    fecha: str,
+    section: str,
+    item_id: str,
+    photos: list[tuple[bytes, str, bytes | None]],
+) -> list[str]:
+    """Save several `(photo_data, photo_name, thumb_data)` for one item in a single insert_many."""
+    if not photos:
+        return []
+    docs = [
+        _photo_doc(local, fecha, section, item_id, data, name, thumb)
+        for data, name, thumb in photos
+    ]
+    result = _col().insert_many(docs, ordered=False)
+    return [str(i) for i in result.inserted_ids]
+
+
+def _photo_doc(
+    local: str,
+    fecha: str,
+    section: str,
+    item_id: str,
+    photo_data: bytes,
+    photo_name: str,
+    thumb_data: bytes | None,
+) -> dict[str, Any]:
     doc = {
         "local": local,
         "fecha": fecha,
@@ -79,8 +115,9 @@ def save_photo(
         "size_bytes": len(photo_data),
         "created_at": datetime.now(timezone.utc),
     }
-    result = _col().insert_one(doc)
-    return str(result.inserted_id)
+    if thumb_data is not None:
+        doc["thumb_data"] = thumb_data
+    return doc
 
 
 def get_photos_for_item(
@@ -94,6 +131,32 @@ def get_photos_for_item(
     return list(cursor)
 
 
+def get_photo_thumbs_for_item(
+    local: str, fecha: str, item_id: str
+) -> list[dict[str, Any]]:
+    """Return photos for an item with only `thumb_data` (for on-screen previews).
+
+    Photos saved before thumbnails existed fall back to their full `photo_data`.
+    """
+    col = _col()
+    photos = list(
+        col.find(
+            {"local": local, "fecha": fecha, "item_id": item_id},
+            {"thumb_data": 1, "photo_name": 1, "_id": 1},
+        ).sort("photo_name", 1)
+    )
+    missing = [p["_id"] for p in photos if "thumb_data" not in p]
+    if missing:
+        full = {
+            doc["_id"]: doc["photo_data"]
+            for doc in col.find({"_id": {"$in": missing}}, {"photo_data": 1})
+        }
+        for p in photos:
+            if "thumb_data" not in p:
+                p["thumb_data"] = full.get(p["_id"], b"")
+    return photos
+
+
 def get_photo_counts(local: str, fecha: str) -> dict[str, int]:
     """Return {item_id: photo_count} for progress tracking."""
     pipeline = [
@@ -122,22 +185,31 @@ def delete_photo(photo_id: str) -> bool:
     return result.deleted_count > 0
 
 
-def get_all_photos(local: str, fecha: str) -> list[dict[str, Any]]:
-    """Return all photos for an audit (for ZIP generation)."""
+def get_all_photos(local: str, fecha: str) -> Iterator[dict[str, Any]]:
+    """Iterate all photos for an audit (for ZIP generation).
+
+    Streams from a small-batch cursor so only a few photos are held in memory at once.
+    """
     cursor = _col().find(
         {"local": local, "fecha": fecha},
-        {"photo_data": 1, "photo_name": 1, "section": 1, "item_id": 1, "_id": 0},
+        {"photo_data": 1, "photo_name": 1, "section": 1, "item_id": 1, "created_at": 1, "_id": 0},
+        batch_size=8,
     ).sort([("section", 1), ("item_id", 1), ("photo_name", 1)])
-    return list(cursor)
+    yield from cursor
 
 
 def next_photo_name(local: str, fecha: str, item_id: str) -> str:
     """Generate the next sequential photo name for an item."""
+    return next_photo_names(local, fecha, item_id, 1)[0]
+
+
+def next_photo_names(local: str, fecha: str, item_id: str, n: int) -> list[str]:
+    """Generate the next `n` sequential photo names for an item (one count query)."""
     code = item_id.replace(".", "")
     count = _col().count_documents(
         {"local": local, "fecha": fecha, "item_id": item_id}
     )
-    return f"{code}_{count + 1:03d}.jpg"
+    return [f"{code}_{count + i:03d}.jpg" for i in range(1, n + 1)]
 
 
 def get_audits() -> list[dict[str, str]]:
@@ -219,7 +291,6 @@ def get_audit_history() -> list[dict[str, Any]]:
                 "no_conformes": {
                     "$sum": {"$cond": [{"$eq": ["$status", "No Conforme"]}, 1, 0]}
                 },
-                "last_analyzed": {"$max": "$analyzed_at"},
             }
         },
         {"$sort": {"_id.fecha": -1, "_id.local": 1}},
@@ -234,7 +305,6 @@ def get_audit_history() -> list[dict[str, Any]]:
             "observaciones": doc["observaciones"],
             "no_conformes": doc["no_conformes"],
             "pct_conforme": round(doc["conformes"] / doc["total"] * 100) if doc["total"] else 0,
-            "last_analyzed": doc["last_analyzed"],
         }
         for doc in result
     ]
@@ -522,15 +592,21 @@ def get_monthly_scores(local: str, months: int = 6) -> list[dict[str, Any]]:
 # ══════════════════════════════════════════════════════════════════════════
 
 
+@st.cache_resource(show_spinner=False)
+def _ensure_desvios_indexes(uri: str) -> None:
+    """Create the desvíos indexes once per process, not on every collection access."""
+    col = _connect(uri)["grido_audit"]["desvios"]
+    col.create_index([("local", 1), ("estado", 1)])
+    col.create_index([("local", 1), ("auditoria_fecha", 1)])
+    col.create_index([("item_codigo", 1), ("fecha_deteccion", -1)])
+
+
 def _desvios_col():
     uri = _get_uri()
     if not uri:
         raise RuntimeError("MONGODB_URI not configured")
-    client = _connect(uri)
-    col = client["grido_audit"]["desvios"]
-    col.create_index([("local", 1), ("estado", 1)])
-    col.create_index([("item_codigo", 1), ("fecha_deteccion", -1)])
-    return col
+    _ensure_desvios_indexes(uri)
+    return _connect(uri)["grido_audit"]["desvios"]
 
 
 def _check_recurrence(local: str, item_codigo: str, days: int = 60) -> int:
@@ -584,10 +660,13 @@ def get_desvios(
     local: str | None = None,
     estado: str | None = None,
     seccion: str | None = None,
+    auditoria_fecha: str | None = None,
 ) -> list[dict[str, Any]]:
     filt: dict = {}
     if local:
         filt["local"] = local
+    if auditoria_fecha:
+        filt["auditoria_fecha"] = auditoria_fecha
     if estado:
         filt["estado"] = estado
     if seccion:
@@ -604,6 +683,32 @@ def get_desvios(
     return results
 
 
+def get_plan_semanal(local: str | None = None, limit: int = 10) -> list[dict[str, Any]]:
+    """Top `limit` active desvíos: reincidentes first, then by prioridad (alta → baja)."""
+    match: dict = {"estado": {"$in": ["pendiente", "en_proceso"]}}
+    if local:
+        match["local"] = local
+    pipeline = [
+        {"$match": match},
+        {"$addFields": {
+            "_r": {"$cond": ["$reincidente", 0, 1]},
+            "_p": {"$indexOfArray": [PRIORIDADES, "$prioridad"]},
+        }},
+        # Prioridades desconocidas o ausentes cuentan como "baja".
+        {"$addFields": {"_p": {"$cond": [{"$lt": ["$_p", 0]}, 2, "$_p"]}}},
+        # Se ordena por campos calculados: ningún índice sirve al $sort, pero el
+        # $match usa (local, estado) y el conjunto activo de un local es chico.
+        {"$sort": {"_r": 1, "_p": 1, "fecha_deteccion": -1}},
+        {"$limit": limit},
+        {"$project": {"_r": 0, "_p": 0}},
+    ]
+    results = []
+    for doc in _desvios_col().aggregate(pipeline):
+        doc["_id"] = str(doc["_id"])
+        results.append(doc)
+    return results
+
+
 def update_desvio(desvio_id: str, updates: dict) -> bool:
     from bson import ObjectId
     updates["updated_at"] = datetime.now(timezone.utc)
@@ -622,37 +727,44 @@ def close_desvio(desvio_id: str, comentario: str) -> bool:
 
 
 def get_desvio_kpis(local: str | None = None, days: int = 30) -> dict[str, Any]:
-    filt: dict = {}
-    if local:
-        filt["local"] = local
-    col = _desvios_col()
+    return desvio_kpis(get_desvios(local=local), days=days)
 
-    abiertos = col.count_documents({**filt, "estado": {"$in": ["pendiente", "en_proceso"]}})
-    reincidentes = col.count_documents({**filt, "estado": {"$in": ["pendiente", "en_proceso"]}, "reincidente": True})
 
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-    cerrados_periodo = list(col.find({
-        **filt,
-        "estado": "cumplido",
-        "fecha_cierre": {"$gte": cutoff},
-    }))
-    en_plazo = sum(
-        1 for d in cerrados_periodo
-        if d.get("fecha_limite") and d["fecha_cierre"] <= d["fecha_limite"]
-    )
-    pct_en_plazo = round(en_plazo / len(cerrados_periodo) * 100) if cerrados_periodo else 0
+def as_utc(dt: datetime) -> datetime:
+    """Return `dt` as an aware UTC datetime.
 
-    cutoff_90 = datetime.now(timezone.utc) - timedelta(days=90)
-    cerrados_90 = list(col.find({
-        **filt,
-        "estado": "cumplido",
-        "fecha_cierre": {"$gte": cutoff_90},
-    }))
-    tiempos = [
-        (d["fecha_cierre"] - d["fecha_deteccion"]).days
-        for d in cerrados_90
-        if d.get("fecha_cierre") and d.get("fecha_deteccion")
-    ]
+    pymongo devuelve datetimes naive (en UTC) salvo que el cliente use tz_aware.
+    """
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def desvio_kpis(desvios: list[dict[str, Any]], days: int = 30) -> dict[str, Any]:
+    """Compute the desvío KPIs from an already-fetched `get_desvios` list (no extra queries)."""
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=days)
+    cutoff_90 = now - timedelta(days=90)
+
+    abiertos = 0
+    reincidentes = 0
+    cerrados_periodo = 0
+    en_plazo = 0
+    tiempos = []
+    for d in desvios:
+        estado = d.get("estado")
+        if estado in ("pendiente", "en_proceso"):
+            abiertos += 1
+            if d.get("reincidente"):
+                reincidentes += 1
+        elif estado == "cumplido" and d.get("fecha_cierre"):
+            cierre = as_utc(d["fecha_cierre"])
+            if cierre >= cutoff:
+                cerrados_periodo += 1
+                if d.get("fecha_limite") and cierre <= as_utc(d["fecha_limite"]):
+                    en_plazo += 1
+            if cierre >= cutoff_90 and d.get("fecha_deteccion"):
+                tiempos.append((cierre - as_utc(d["fecha_deteccion"])).days)
+
+    pct_en_plazo = round(en_plazo / cerrados_periodo * 100) if cerrados_periodo else 0
     avg_cierre = round(sum(tiempos) / len(tiempos)) if tiempos else 0
 
     return {
@@ -1,13 +1,35 @@
 """Genera la guía de fotos de auditoría en formato Word (.docx)."""
 
+import cProfile
+import copy
+import hashlib
+import io
+import logging
+import os
+import sys
+import zipfile
+import zlib
+from pathlib import Path
+from xml.sax.saxutils import escape
+
 from docx import Document
 from docx.shared import Pt, Inches, Cm, RGBColor
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_TABLE_ALIGNMENT
-from docx.oxml.ns import qn
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+try:  # API privada de python-docx (ver _package_entries)
+    from docx.opc.pkgwriter import _ContentTypesItem
+except ImportError:
+    _ContentTypesItem = None
+from lxml import etree
 
 OUTPUT = "GUIA_FOTOS_AUDITORIA.docx"
 
+log = logging.getLogger(__name__)
+
 RED = RGBColor(0xE6, 0x39, 0x46)
 DARK_BLUE = RGBColor(0x1D, 0x35, 0x57)
 WHITE = RGBColor(0xFF, 0xFF, 0xFF)
@@ -15,41 +37,588 @@ GREEN = RGBColor(0x2E, 0xCC, 0x71)
 ORANGE = RGBColor(0xF3, 0x9C, 0x12)
 LIGHT_GRAY = RGBColor(0xF0, 0xF0, 0xF0)
 
+PT9 = Pt(9)
+PT10 = Pt(10)
+
+HEADING_STYLES = {1: "RedHeading1", 2: "BlueHeading2"}
+
+# Alto de un párrafo Normal vacío (línea de 10 pt × 1,15 + 10 pt de espacio posterior).
+EMPTY_LINE = Pt(24)
+
+# Los mismos colores como hex, para los fragmentos XML que se emiten directo.
+RED_HEX = str(RED)
+DARK_BLUE_HEX = str(DARK_BLUE)
+WHITE_HEX = str(WHITE)
+TEXT_GRAY_HEX = "666666"
+ROW_ALT_HEX = "F8F9FA"
+
+
+# ── Contenido de la guía ──
+
+SECTIONS_DATA = (
+    ("A", "INFRAESTRUCTURA: Estado de conservación y limpieza",
+     "Cada 2 MESES (solo en auditoría COMPLETA)", (
+        ("A.1", "Exterior (pisos, zócalos, cordón cuneta, techos, muros, iluminación, pérgolas, toldos, bicicletero, dog parking, juegos infantiles)", (
+            "Vista general de la vereda/exterior del local (desde la calle, que se vea el frente completo incluyendo pisos y cordón cuneta).",
+            "Pisos exteriores en detalle: juntas, rejillas, deck (si aplica). Acercarse para que se vean las condiciones de las piezas.",
+            "Muros y zócalos exteriores: foto de cada pared exterior visible.",
+            "Techos y cielorrasos exteriores (pérgola, toldo). Foto mirando hacia arriba desde abajo.",
+            "Bicicletero / dog parking / juegos infantiles exteriores (si existen). Una foto de cada uno mostrando estado general.",
+            "Iluminación exterior: foto de los artefactos de luz (reflectores, lámparas LED). Si es de noche, foto con luces encendidas.",
+        ), "Si hay defectos visibles (graffitis, piezas rotas, manchas), sacar foto extra en detalle."),
+        ("A.2", "Marquesina: Estado y limpieza", (
+            "Vista frontal completa de la marquesina (que se vea toda la estructura, chapas, logo corpóreo).",
+            "Detalle del logo corpóreo y su iluminación.",
+            "Cartel bandera y/o saliente (si existe). Foto lateral.",
+            "Detalle de limpieza: acercar a la marquesina para ver polvo, manchas, óxido o suciedad acumulada.",
+        ), "Si es horario nocturno: foto adicional con reflectores encendidos."),
+        ("A.3", "Mobiliario: Estado y limpieza (mesas, sillas, sombrillas, living)", (
+            "Vista general del sector de mesas y sillas (conjunto completo, orden y distribución).",
+            "Detalle de una mesa: superficie de la tapa, ploteo, estado de pintura.",
+            "Detalle de una silla: patas, regatones, estado de pintura, soldaduras.",
+            "Sombrillas (si existen): foto general mostrando estado y estabilidad.",
+            "Living (si existe): foto de sillones/tapizados mostrando estado del tapizado, lonas, estructura.",
+        ), "Si hay defectos (óxido, pinturas descascaradas, tapizados rotos): foto extra en detalle."),
+        ("A.4", "Iluminación interior: Estado y limpieza", (
+            "Vista general del salón mostrando todas las luminarias (que se aprecie si están encendidas y si la luz es suficiente).",
+            "Vista general del AMH mostrando luminarias.",
+            "Detalle de un plafón/luminaria de cerca (para ver limpieza, presencia de insectos, estado).",
+            "Foto de cualquier luminaria apagada o con defecto visible.",
+        ), None),
+        ("A.5", "Pisos, aberturas, techo y zócalos en salón: Estado y limpieza", (
+            "Pisos del salón: vista general (que se vean las juntas, estado de las piezas, zócalos).",
+            "Detalle de zócalos: acercar a la unión piso-pared.",
+            "Aberturas/puertas de ingreso: foto frontal mostrando vidrios, herrajes, estado general.",
+            "Detalle de vidrios: buscar rajaduras, falta de masilla, vinilos/fajas.",
+            "Techo/cielorraso del salón: foto mirando hacia arriba.",
+            "Alfombra de ingreso (si existe): foto de cerca mostrando estado.",
+        ), "Si hay cortina metálica: foto cuando está abierta (buscar graffitis en cara interna)."),
+        ("A.6", "Muros y revestimientos de muros en salón: Estado y limpieza", (
+            "Pared principal del salón (revestimiento nebraska, cuadros, ploteos).",
+            "Pared del AMH: cerámicos bricks, estado de juntas.",
+            "Detalle de cuadros decorativos (bien puestos, imágenes autorizadas).",
+            "Zócalos y repisas corian en unión de módulos con pared de bricks.",
+            "Cualquier pared con humedad, pintura descascarada, cerámicos rotos o faltantes (foto de detalle).",
+        ), None),
+        ("A.7", "Cartelera: Estado y limpieza", (
+            "Vista frontal completa de la cartelera (que se lean los precios y se vean todas las pantallas/láminas).",
+            "Detalle de precios: foto acercada donde se verifique que son los autorizados.",
+            "Sabores faltantes: foto mostrando si están marcados correctamente (sticker o marcación del sistema).",
+            "Estado de limpieza de la cartelera: marcos, cables, estructura.",
+        ), None),
+        ("A.8", "Mostradores: Estado y limpieza", (
+            "Vista frontal completa del mostrador (desde el lado del cliente).",
+            "Detalle de la piedra del mostrador: buscar rajaduras, roturas.",
+            "Vidrios del mostrador: estado, limpieza, fijación.",
+            "Material de comunicación exhibido en el mostrador.",
+            "Iluminación del mostrador (si aplica): foto mostrando si funciona.",
+        ), None),
+        ("A.9", "Separación de áreas / Orden y estado del depósito", (
+            "Puerta de ingreso al depósito: señalización visible.",
+            "Vista general del depósito (que se vea el orden, distribución, estanterías, tarimas).",
+            "Paredes del depósito: cerámicos, pintura, estado de juntas.",
+            "Pisos del depósito: foto de cerca mostrando uniones curvas pared-piso, estado general.",
+            "Techo/cielorraso del depósito.",
+            "Estanterías y tarimas: material, estado, separación de 5 cm respecto de la pared.",
+            "Casilleros de colaboradores (interior si es posible).",
+            "Tarima de recepción de mercadería: foto mostrando existencia y material.",
+        ), "Si existe cámara de frío: foto adicional del interior mostrando piso sanitario, estantes, burletes."),
+        ("A.10", "¿El local permite descarga eficiente de productos congelados?", (
+            "Puerta de ingreso por donde pasa el carrito/zorrita (que se aprecie el ancho).",
+            "Recorrido desde la puerta hasta el depósito (posibles obstáculos, escaleras, desniveles).",
+            "Rampa (si existe) o escaleras con su señalización.",
+            "Espacio de estacionamiento frente al local para el camión.",
+        ), None),
+        ("A.11", "¿Hay espacio disponible para descansar?", (
+            "Vista general del espacio de descanso de colaboradores.",
+            "Detalle del mobiliario (sillas/mesa) y limpieza del sector.",
+            "Foto mostrando que no hay insumos ni mobiliario almacenado en ese espacio (o foto si los hay).",
+        ), None),
+    )),
+    ("B", "EXPERIENCIA DEL CLIENTE",
+     "Cada 2 MESES (solo en auditoría COMPLETA)", (
+        ("B.1", "Portal de Novedades, musicalización en exterior y en salón", (
+            "TV del salón encendido mostrando el portal de novedades (que se vea la pantalla y el contenido).",
+            "Equipo de música / parlantes: ubicación y estado.",
+            "Cables de conexión: foto mostrando si están ordenados u ocultos.",
+            "Vista general del salón donde se aprecie la ubicación del TV (verificar que NO esté en el AMH).",
+        ), None),
+        ("B.2", "Climatización y ventilación: Estado y limpieza", (
+            "Equipo de aire acondicionado: vista general de la unidad interior.",
+            "Detalle de rejillas y filtros del equipo (acercar para ver limpieza, polvo, suciedad).",
+            "Manguera de desagote y bidón de recolección.",
+            "Carcasa del equipo: buscar telas de araña, manchas de sarro.",
+            "Si hay equipo exterior (compresor): foto mostrando estado.",
+        ), "IMPORTANTE: si se usa calefactor, estufa o ventilador NO autorizado, fotografiar el equipo."),
+        ("B.3", "Dispenser de agua", (
+            "Dispenser completo: vista frontal mostrando ubicación en salón/AMH.",
+            "Detalle de canillas y receptáculo/rejilla de goteo.",
+            "Estado de higiene de la carcasa y bandeja inferior.",
+            "Disponibilidad de vasos junto al dispenser.",
+        ), None),
+        ("B.4", "Matafuegos, luces de emergencia, instalación eléctrica y señalética", (
+            "Matafuegos del salón: foto completa mostrando ubicación, accesibilidad y que está colgado.",
+            "Detalle de la etiqueta de carga del matafuegos (fecha de vencimiento, tipo ABC, peso).",
+            "Matafuegos del depósito (si hay otro).",
+            "Luz de emergencia del salón: foto mostrando que está enchufada.",
+            "Luz de emergencia del depósito.",
+            "Tablero eléctrico: foto mostrando tapas sanas, señalética de riesgo eléctrico, llaves térmicas y disyuntor.",
+            "Señalética de salida de emergencia.",
+            "Desniveles/escalones: foto mostrando señalización en amarillo o rojo (o la falta de ella).",
+        ), "Si hay barandas (escaleras, terrazas): foto adicional mostrando estado e instalación."),
+        ("B.5", "Baño para clientes", (
+            "Puerta del baño con señalización visible.",
+            "Vista general del interior del baño.",
+            "Inodoro: tapa completa, botón/mochila funcionando.",
+            "Lavamanos: grifería, dispenser de jabón con contenido, dispenser de toallas con contenido.",
+            "Espejo: estado, película antiestallido.",
+            "Ventiluz/extractor: estado de la tela mosquitera.",
+            "Secamanos eléctrico (si existe): enchufado y funcionando.",
+        ), "Si hay cambiador para bebés: foto adicional mostrando estado."),
+        ("B.6", "Sector de juegos infantiles", (
+            "Vista general del sector de juegos (conjunto completo, piso blando, delimitación).",
+            "Detalle de cada juego: estructura, fijaciones, pintura.",
+            "Piso blando/goma: foto de cerca mostrando que cubre toda la superficie del juego.",
+            "Estado de higiene: buscar pegotes de helado, suciedad acumulada.",
+            "Maquinitas (si existen): foto mostrando estado y funcionamiento.",
+        ), "NO APLICA si el local no tiene sector infantil."),
+        ("B.7", "SmartFran - Club Grido - Conexión y funcionamiento", (
+            "Pantalla de SmartFran / sistema loyalty mostrando que está logueado y funcionando.",
+            "Lector de tarjetas Club Grido: foto del dispositivo.",
+            "Tabla de canjes oficial impresa: foto mostrando que está exhibida y a la vista del cliente.",
+        ), None),
+        ("B.8", "APP GRIDO: Gestión del canal digital", (
+            "Material de comunicación de descarga de la APP exhibido en el local (soporte fijo).",
+            "Captura de pantalla de la APP mostrando que el local está disponible/activo en take away.",
+            "Captura de pantalla del panel de pedidos mostrando pedidos efectivos y cancelados del último mes.",
+        ), None),
+        ("B.9", "Posnet y Grido Go (tótem autogestión)", (
+            "Posnet: foto mostrando el equipo conectado y en funcionamiento.",
+            "Tótem de autogestión (si existe): vista frontal completa mostrando pantalla encendida.",
+            "Detalle del tótem: elementos completos, estado de higiene.",
+        ), "NO APLICA el tótem si el local no lo tiene."),
+        ("B.10", "Disponibilidad de Wi-Fi para el cliente", (
+            "Señalética oficial de Wi-Fi exhibida en el local.",
+            "Captura de pantalla del celular mostrando que la red Wi-Fi está disponible.",
+            "Ubicación de la señalética en contexto (que se vea dónde está colocada).",
+        ), None),
+        ("B.11", "¿Dispone de generador eléctrico?", (
+            "Generador eléctrico: vista general mostrando ubicación.",
+            "Detalle del equipo: estado, conexiones.",
+            "Si NO tiene generador: foto del tablero eléctrico general.",
+        ), None),
+    )),
+    ("C", "OPERATORIA DIARIA",
+     "MENSUAL (en auditoría COMPLETA y RÁPIDA)", (
+        ("C.1", "Disponibilidad de productos a granel", (
+            "Vista general del pozo/mostrador de granel abierto mostrando todos los sabores disponibles.",
+            "Foto panorámica de la cartelera de sabores (para cruzar contra lo que hay en el mostrador).",
+            "Detalle de los huecos vacíos donde faltan sabores (si los hay).",
+            "Foto de sabores marcados como faltantes en la cartelera.",
+        ), None),
+        ("C.2", "Disponibilidad y exhibición de productos secos e insumos generales", (
+            "Zona de toppings: nueces, tramontana, frutilla, crispines, ensalada de frutas. Foto de conjunto.",
+            "Salsas: foto mostrando variedad disponible (500g y 120g).",
+            "Vasos, cucharitas, envases térmicos: foto del sector de insumos.",
+            "Servilleteros en el salón: foto mostrando cantidad y distribución.",
+            "Exhibidora de Grido Tops: foto frontal mostrando variedades, estado y vinilo/faja.",
+            "Grido Market: foto frontal del exhibidor mostrando productos de frente y nivel de ocupación (3/4 mínimo).",
+            "Otros exhibidores de productos temporales: foto mostrando precios autorizados.",
+        ), None),
+        ("C.3", "Condiciones de almacenamiento, fraccionamiento y rotulado", (
+            "Estantería del depósito: vista general mostrando el orden de productos (limpieza abajo, materias primas medio, envases arriba).",
+            "Productos sobre tarimas: foto que permita apreciar la altura respecto del piso (mínimo 14 cm).",
+            "Detalle de etiquetas de productos cerrados: que se lean RNE, RNPA, fecha de elaboración/vencimiento.",
+            "Sector de productos fallados/vencidos: foto de la cartelería que los identifica.",
+            "Recipientes de productos fraccionados: foto mostrando cierre hermético, estado, etiqueta (producto, marca, fechas).",
+            "Registro de productos fraccionados: foto del documento impreso o pantalla digital de los últimos 30 días.",
+            "Interior de la cámara de frío (si aplica): foto mostrando estibado.",
+        ), None),
+        ("C.4", "Equipos de frío: Higiene y mantenimiento (pozos, cámaras, freezer, exhibidora, toppinera, frigobar)", (
+            "Freezer del depósito: vista externa (ploteo, tapas, burletes).",
+            "Freezer del depósito: interior abierto (hielo acumulado, limpieza).",
+            "Pozo de frío del mostrador: vista superior abierta.",
+            "Exhibidora vertical (impulsivos): foto frontal completa mostrando ploteo, cenefa, vidrios.",
+            "Exhibidora horizontal (si existe): foto superior abierta.",
+            "Toppinera: foto mostrando estado, tapas, limpieza.",
+            "Frigobar: foto abierto mostrando interior (productos en tuppers cerrados y rotulados).",
+            "Cámara de frío (si existe): burletes de puerta, cortina sanitaria, piso sanitario.",
+        ), None),
+        ("C.5", "Temperatura de equipos de frío", (
+            "Termómetro del pozo de granel en mostrador mostrando temperatura (debe estar entre -13,5°C y -15°C).",
+            "Termómetro del freezer del depósito mostrando temperatura (debe estar a -18°C).",
+            "Termómetro de la cámara de frío (si aplica) mostrando -18°C.",
+            "Termómetro de la exhibidora de impulsivos mostrando -18°C.",
+            "Foto de helados a granel de cerca: verificar que no haya cristalización, deformación o pérdida de consistencia.",
+        ), None),
+        ("C.6", "Capacidad de frío en la franquicia", (
+            "Vista general de todos los equipos de frío del depósito (cantidad total de freezers/cámaras).",
+            "Detalle de la capacidad: foto del interior de un freezer representativo con nivel de ocupación.",
+            "Cámara de frío (si existe): vista general del interior.",
+        ), None),
+        ("C.7", "Prevención de la contaminación cruzada", (
+            "Cajas de helado a granel en el pozo: foto superior mostrando estado de las cajas (solapas, presentación, bajado).",
+            "Detalle de 2-3 latas/cajas: buscar presencia de hielo, restos de cucuruchos u otros sabores.",
+            "Interior de las cajas/baschetas: foto que muestre si están \"demasiado limpias\" (indicio de limpieza con esponja).",
+            "Colaborador atendiendo: foto mostrando manipulación correcta (cucuruchos con servilleta, térmicos por la base).",
+            "Lavamanos del AMH: foto mostrando que está accesible para lavado de manos frecuente.",
+            "Tarima sanitaria (si se está reponiendo): foto mostrando cajas fuera del freezer sobre tarima.",
+        ), None),
+        ("C.8", "Abastecimiento de agua", (
+            "Grifo del AMH: foto mostrando salida de agua fría y caliente.",
+            "Grifo del depósito: ídem.",
+            "Tanque de agua (si se tiene acceso): foto mostrando estado de limpieza.",
+            "Foto del agua corriendo: verificar que no está turbia.",
+        ), None),
+        ("C.9", "AMH (mesadas, bacha, lavabochero, grifo monocomando)", (
+            "Vista general del AMH completo (mesada, bacha, bajomesada).",
+            "Detalle de la bacha: estado, limpieza, desagüe.",
+            "Lavabochero: foto mostrando estado y limpieza del agua.",
+            "Monocomando: foto de cerca mostrando estado y funcionamiento.",
+            "Bajomesada abierto: foto mostrando interior (puertas, melamina, herrajes, ausencia de objetos personales).",
+            "Mesada: estado de la piedra, limpieza, ausencia de elementos ajenos al sector.",
+        ), None),
+        ("C.10", "Equipos de producción (licuadora, cremera, chocolatera, maq. café, bols, utensilios)", (
+            "Licuadora: foto completa mostrando vaso, base, cables.",
+            "Chocolatera: foto mostrando nivel de chocolate, tapa, cuchara.",
+            "Cremera: foto mostrando pico, estado de la rosca.",
+            "Máquina de café: foto frontal, detalle de base y desagüe.",
+            "Bols con tapa: foto mostrando estado y limpieza (incluida tapa).",
+            "Utensilios alineados: foto de las 6 paletas, 6 bocheros y 4 corvetes juntos (para contar cantidad y verificar material).",
+            "Detalle de mangos de utensilios: foto de cerca verificando que sean de acero inoxidable (no madera, no aluminio).",
+            "Termómetro de punción: foto mostrando estado y limpieza.",
+        ), None),
+        ("C.11", "Equipos complementarios (balanza, microondas, caja, PC)", (
+            "Balanza: foto mostrando visor a la vista del cliente, estado de la bandeja.",
+            "Microondas: foto frontal mostrando display, puerta, plato.",
+            "Microondas abierto: foto del interior mostrando limpieza.",
+            "Sector de caja/PC: foto mostrando orden de cables y ausencia de papeles con vista al cliente.",
+            "Vista desde el lado del cliente del sector caja: verificar que no hay papeles, notas o elementos no autorizados.",
+        ), None),
+        ("C.12", "Elementos de higiene personal (dispenser jabón y toallas en depósito y AMH)", (
+            "Dispenser de jabón en AMH: foto mostrando estado, fijación a la pared, contenido.",
+            "Dispenser de toallas en AMH: foto mostrando estado y contenido.",
+            "Dispenser de jabón en depósito: foto ídem.",
+            "Dispenser de toallas en depósito: foto ídem.",
+        ), None),
+        ("C.13", "Elementos de limpieza y desinfección. Ausencia de sustancias peligrosas", (
+            "Sector de almacenamiento de productos de limpieza: foto mostrando ubicación, cartelería, separación de materia prima.",
+            "Rejillas extendidas: foto mostrando las de cada color (blanco = AMH, amarillo = salón/exterior, otro = baño).",
+            "Esponjas: foto mostrando tipo (verificar que NO sean metálicas en AMH).",
+            "Escobillón, escoba, pala, secador, mopa: foto mostrando estado y tipo de cabo (plástico o metal forrado, NO madera).",
+            "Productos químicos: foto mostrando envases cerrados, identificados con etiqueta original.",
+            "Foto general del sector verificando que NO hay plaguicidas, venenos, nafta, solventes, insecticidas.",
+            "Generador eléctrico en depósito (si aplica): verificar que tiene cobertura.",
+        ), None),
+        ("C.14", "¿El baño de los colaboradores está en condiciones?", (
+            "Vista general del baño de colaboradores.",
+            "Paredes y pisos: buscar hongos, humedad, suciedad.",
+            "Techo: buscar telas de araña.",
+            "Ventiluz/extractor con tela mosquitera.",
+            "Insumos: papel higiénico, toalla de mano, jabón disponibles.",
+        ), None),
+        ("C.15", "Higiene y Salud del Colaborador", (
+            "Foto de cada colaborador presente de frente (cuerpo completo): verificar uniforme, cofia, pelo recogido, ausencia de adornos.",
+            "Detalle de manos de cada colaborador: uñas cortas, limpias, sin esmalte, sin anillos/pulseras.",
+            "Colaborador manipulando producto: verificar buenas prácticas (cucurucho con servilleta, sin tocar con manos).",
+            "Foto del lavamanos con jabón accesible en AMH.",
+        ), "NOTA: pedir permiso al colaborador antes de fotografiarlo."),
+        ("C.16", "Uniforme del Colaborador", (
+            "Foto de cada colaborador de cuerpo completo: verificar cofia, delantal jean, remera, pantalón jean.",
+            "Detalle del logo del uniforme (verificar que está actualizado).",
+            "Calzado: foto de los pies mostrando calzado cerrado.",
+            "Estado del uniforme: buscar roturas, remiendos, decoloración.",
+        ), None),
+        ("C.17", "Conocimiento del colaborador", (), "ESTE ÍTEM NO REQUIERE FOTOS. Se evalúa mediante pregunta verbal aleatoria al colaborador sobre productos o procedimientos. Anotar la pregunta realizada y la respuesta obtenida en un texto o audio."),
+        ("C.18", "Constancia AFIP, Inscripción Provincial, Habilitación Municipal, Carnet Sanitario y Control de plagas", (
+            "Constancia de Inscripción AFIP exhibida.",
+            "Inscripción Provincial (Ingresos Brutos) exhibida.",
+            "Habilitación Municipal exhibida.",
+            "Carnet de manipulador de alimentos de cada colaborador presente (foto de cada carnet vigente).",
+            "Certificado de desinfección exhibido (verificar que no esté vencido, con sello y firma) + formulario MIP.",
+        ), None),
+    )),
+    ("D", "IMAGEN: Formato y Estética",
+     "Cada 2 MESES (solo en auditoría COMPLETA)", (
+        ("D.1", "Exterior: Formato (pisos, zócalos, muros, iluminación, pérgolas, toldos)", (
+            "Vista frontal completa del local desde la calle (colores de muros, techo, cajón de cortina metálica).",
+            "Pisos exteriores: material y formato (verificar contra planilla técnica).",
+            "Pérgola/toldo: foto mostrando formato y color.",
+            "Motores de aire acondicionado en fachada: ubicación correcta.",
+            "Color de muros exteriores y techos: foto que permita comparar con el color autorizado.",
+        ), None),
+        ("D.2", "Marquesina: formato", (
+            "Marquesina completa de frente: verificar logo NUEVO.",
+            "Saliente de pared: verificar imagen actualizada.",
+            "Cartel bandera (si existe): verificar si está actualizado.",
+            "Brazos reflectores: verificar que sean LED.",
+        ), None),
+        ("D.3", "Comunicación en vidriera", (
+            "Vidriera completa de frente: que se vean todos los soportes de comunicación, vinilos y microperforados.",
+            "Faja esmerilada: foto mostrando diseño y altura (90 cm del piso).",
+            "Soportes de comunicación: foto de cada uno (máximo 2 permitidos).",
+            "Puerta: foto mostrando carteles de servicio (abierto-cerrado, horarios, Club Grido, WiFi).",
+            "Cartel \"se busca personal\" (si existe): verificar ubicación en puerta por sobre la faja y formato autorizado.",
+            "Cartel Delivery (si existe): verificar diseño autorizado.",
+        ), None),
+        ("D.4", "Mobiliario exterior: formato (mesas, sillas, sombrillas, cerco)", (
+            "Vista general de mesas y sillas exteriores: verificar modelo (ONE o Río) y colores.",
+            "Detalle de una silla: verificar modelo (ONE: blanco/azul/rojo o naranja; o Río). Verificar que NO convivan rojas con naranjas.",
+            "Sombrillas: color (blancas o azules), formato según ficha.",
+            "Cerco o maceteros delimitando el sector (si aplica).",
+            "Bancos (si existen): verificar modelo (metálicos azules o madera según ficha, que NO convivan).",
+        ), "Si hay comunicación en mesas o servilleteros: foto de detalle."),
+        ("D.5", "Mobiliario interior: formato (mesas, sillas, living)", (
+            "Vista general del salón interior con mesas y sillas.",
+            "Detalle del modelo de sillas interiores (ONE o Río; que NO convivan en el mismo sector).",
+            "Barra con banquetas (si existe): verificar modelo MILO.",
+            "Living (si existe): butacón BARI con mesa ratona de madera O sillón PAMPA con mesa ratona blanca.",
+            "Verificar ausencia de bancos metálicos en el salón.",
+        ), None),
+        ("D.6", "Iluminación interior: formato", (
+            "Luminarias del AMH: verificar tipo autorizado (plafones LED, riel blanco, galponeras, bandejas) y tono (frío o neutro).",
+            "Luminarias del sitting/salón: verificar tipo y tono (cálido o neutro).",
+            "Lámparas colgantes (si existen): verificar formato autorizado.",
+            "Detalle de un artefacto de iluminación (modelo/marca).",
+        ), None),
+        ("D.7", "Pisos, aberturas, techo y zócalos en salón: Formato", (
+            "Pisos del salón: verificar material y color según planilla técnica.",
+            "Techo/cielorraso: verificar que es del mismo color que los muros.",
+            "Iluminación de la garganta del AMH: verificar luces blancas, cálidas o neutras (NO de color).",
+            "Cortinas (si existen): verificar que sean blackout, solo en sitting, de color autorizado.",
+            "Alfombra de ingreso: estado y formato actualizado.",
+        ), None),
+        ("D.8", "Muros y revestimientos en salón: formato", (
+            "Paredes del salón: verificar color autorizado.",
+            "Ploteos: foto de cada ploteo verificando que estén actualizados.",
+            "AMH: cerámicos bricks presentes y en condiciones.",
+            "Revestimiento de madera/empapelado: verificar logo actualizado (no el viejo).",
+            "Zócalos y repisas corian: presentes en la unión módulos-bricks.",
+            "Caja de durlock cubriendo rollos de cortina metálica (si aplica): verificar que es del color de los muros.",
+        ), None),
+        ("D.9", "Cartelera: formato", (
+            "Cartelera completa: verificar formato digital vigente.",
+            "TVs: verificar tamaño (43 pulgadas), alineación entre pantallas.",
+            "Foto desde la caja: verificar legibilidad de la primera lámina.",
+            "Sabores faltantes marcados en el sistema (si aplica).",
+        ), None),
+        ("D.10", "Mostradores: formato", (
+            "Mostrador completo de frente: verificar modelo nebraska/báltico.",
+            "Detalle del logo en el mostrador (verificar actualizado).",
+            "Material de comunicación en el mostrador: verificar autorizado.",
+            "Vidrios e iluminación del mostrador.",
+        ), None),
+        ("D.11", "Decoración, plantas, jardines y cestos", (
+            "Plantas del salón y exterior: estado y distribución.",
+            "Decoraciones de fecha especial (si aplica): terminación y completitud.",
+            "Cestos del salón: modelo autorizado (plástico tapa vaivén).",
+            "Cestos exteriores: modelo autorizado (chapa).",
+            "Cesto del baño: verificar modelo a pedal.",
+        ), "Si hay soporte de vereda/cartel sandwich: foto verificando que NO esté escrito a mano."),
+        ("D.12", "Sector de juegos infantiles (formato)", (
+            "Vista general del sector: empapelado que define el sector, delimitación.",
+            "Juegos: verificar estado de seguridad y formato.",
+            "Piso blando interior o césped exterior.",
+            "Maquinitas (máximo 1): verificar ubicación en sector infantil.",
+        ), "NO APLICA si el local no tiene sector infantil."),
+        ("D.13", "Circuito ingreso-compra-consumo-salida: ¿es claro y cómodo?", (
+            "Desde la puerta de entrada mirando hacia adentro: que se vea el AMH enfrentado a la puerta.",
+            "Recorrido del cliente: foto mostrando la secuencia natural desde el ingreso hacia el mostrador.",
+            "Sector de autoservicio: verificar que está antes o junto a caja.",
+            "Sector infantil: verificar que está fuera de zona de riesgo.",
+        ), None),
+        ("D.14", "¿La cantidad de puestos de trabajo y cajas es coherente?", (
+            "Vista del AMH completo mostrando la cantidad de puestos de trabajo operativos.",
+            "Sector de caja(s): foto mostrando cuántas cajas hay.",
+            "Ventana take away (si existe para delivery de alta demanda).",
+        ), None),
+        ("D.15", "¿La franquicia se encuentra ordenada?", (
+            "Vista panorámica del salón: distanciamiento entre mesas.",
+            "Identificación de sectores: infantil, living, sitting general.",
+            "Servicios complementarios implementados.",
+            "Vista general desde la puerta mostrando el orden general.",
+        ), None),
+        ("D.16", "En términos generales, ¿el local cumple con los requisitos de marca?", (
+            "Fachada completa del local desde la vereda de enfrente.",
+            "Vista panorámica interior del salón completo.",
+            "Vista panorámica del AMH completo.",
+        ), None),
+    )),
+    ("E", "OFERTA Y STOCK",
+     "Cada 2 MESES (solo en auditoría COMPLETA)", (
+        ("E.1", "Disponibilidad y exhibición de impulsivos", (
+            "Exhibidora vertical: foto frontal completa (verificar ploteo vinilo simil acero inoxidable, productos de cara al cliente, ocupación mínima 3/4).",
+            "Exhibidora horizontal (si existe): foto superior abierta (productos de cara, cajas cerradas, canastos con sueltas).",
+            "Detalle del ploteo/vinilo: estado, marca (Mc Cal 6076).",
+            "Cenefa de la exhibidora: estado y precios autorizados.",
+            "Vinilos de promociones o señalética: estado y autorización.",
+            "Detalle de productos faltantes o espacios vacíos.",
+        ), "Verificar que NO hay pozos o freezers operativos en el salón."),
+        ("E.2", "Disponibilidad y exhibición de congelados (Frizzio)", (
+            "Exhibidora exclusiva Frizzio: foto frontal mostrando todas las familias de productos exhibidas.",
+            "Cenefa Frizzio (horizontales) o vinilo (verticales): estado y actualización.",
+            "Pieza de comunicación Frizzio en vidriera (A1) o sector caja (A5).",
+            "Precios en vinilo (verificar que NO son en papel ni a mano).",
+            "Nivel de ocupación de la exhibidora (mínimo 3/4).",
+        ), None),
+        ("E.3", "¿Posee cámara de frío?", (
+            "Cámara de frío: vista exterior mostrando puerta y ubicación.",
+            "Interior de la cámara: vista general.",
+            "Si está fuera de la franquicia: foto mostrando ubicación/acceso.",
+        ), "Si NO posee cámara de frío: 1 foto del depósito mostrando que no existe."),
+        ("E.4", "¿La cámara de frío tiene estantes?", (
+            "Interior de la cámara: foto mostrando estantes (si existen).",
+            "Palets/piso sanitario: foto de detalle.",
+            "Combinación de estantes y palets (si aplica).",
+        ), "NO APLICA si el local no tiene cámara de frío."),
+        ("E.5", "¿Cumple con capacidad de frío ideal?", (
+            "Todos los equipos de frío alineados o en vista general (para estimar capacidad total).",
+            "Etiqueta/placa de cada freezer o equipo mostrando capacidad en litros.",
+            "Interior de equipos mostrando nivel de ocupación actual.",
+        ), None),
+    )),
+)
+
+TIPS = (
+    "Sacá las fotos con buena iluminación y sin flash directo.",
+    "No uses filtros ni editores de imagen.",
+    "Intentá que las fotos estén bien enfocadas y sin movimiento.",
+    "Nombrá cada foto con el código del ítem (A1_01, A1_02, etc.) o agrupalas en carpetas por sección (A, B, C, D, E).",
+    "Si encontrás un defecto: sacale una foto general y una de detalle.",
+    "Las fotos de documentos (carnets, certificados, registros) deben ser legibles: acercar lo suficiente para que se lean las fechas.",
+    "Las fotos de termómetros deben mostrar la lectura con claridad.",
+    "Si un ítem \"No Aplica\" a tu local, anotalo y no saques fotos.",
+    "Aprovechá el recorrido natural: empezá por afuera (A.1, A.2), entrá al salón (A.3-A.8), seguí al depósito (A.9), y luego recorré los demás ítems en orden.",
+)
+
+
+# Prototipos <w:shd> por color: se clonan con deepcopy en vez de armar cada nodo.
+_SHADING_PROTOTYPES = {}
 
-def set_cell_shading(cell, color_hex: str):
-    shading = cell._tc.get_or_add_tcPr()
-    s = shading.makeelement(qn("w:shd"), {
-        qn("w:fill"): color_hex,
-        qn("w:val"): "clear",
-    })
-    shading.append(s)
 
-
-def add_styled_table(doc, headers, rows, col_widths=None, header_color="1D3557"):
+def set_cell_shading(cell, color_hex: str):
+    proto = _SHADING_PROTOTYPES.get(color_hex)
+    if proto is None:
+        proto = parse_xml(f'<w:shd {nsdecls("w")} w:fill="{color_hex}" w:val="clear"/>')
+        _SHADING_PROTOTYPES[color_hex] = proto
+    cell._tc.get_or_add_tcPr().append(copy.deepcopy(proto))
+
+
+_PRECOMPRESSED = (".jpeg", ".jpg", ".png")
+
+
+def _package_entries(doc):
+    """Entradas (nombre, bytes) del zip en orden; el blob de word/document.xml va como None.
+
+    Usa internals de python-docx (_ContentTypesItem, Part.before_marshal) para no
+    serializar el paquete completo; si una versión nueva los cambia, cae a
+    Document.save() y relee el zip resultante.
+    """
+    if _ContentTypesItem is not None:
+        try:
+            return _marshal_entries(doc)
+        except (AttributeError, TypeError):
+            pass
+    log.warning("python-docx sin la API interna esperada; se usa Document.save()")
+    return _saved_entries(doc)
+
+
+def _marshal_entries(doc):
+    package = doc.part.package
+    parts = list(package.iter_parts())
+    for part in parts:
+        part.before_marshal()
+    entries = [
+        (CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob),
+        (PACKAGE_URI.rels_uri.membername, package.rels.xml),
+    ]
+    for part in parts:
+        entries.append((part.partname.membername, None if part is doc.part else part.blob))
+        if len(part.rels):
+            entries.append((part.partname.rels_uri.membername, part.rels.xml))
+    return entries
+
+
+def _saved_entries(doc):
+    buf = io.BytesIO()
+    doc.save(buf)
+    document_name = doc.part.partname.membername
+    with zipfile.ZipFile(buf) as zf:
+        return [
+            (name, None if name == document_name else zf.read(name))
+            for name in zf.namelist()
+        ]
+
+
+def _image_compress_type(data):
+    """STORED o DEFLATED, lo que deje la imagen más chica.
+
+    Las fotos reales ya vienen comprimidas, pero una imagen casi lisa (como el
+    docProps/thumbnail.jpeg de la plantilla) se achica mucho con deflate.
+    """
+    # zlib.compress agrega 6 bytes de cabecera/checksum que el zip no guarda.
+    deflated = len(zlib.compress(data, 1)) - 6
+    return zipfile.ZIP_DEFLATED if deflated < len(data) else zipfile.ZIP_STORED
+
+
+def write_package(file, entries, document_xml):
+    """Escribe el .docx directo con zipfile (deflate nivel 1 en vez del 6 de `doc.save`).
+
+    `file` puede ser una ruta o un objeto tipo archivo.
+    """
+    with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for name, blob in entries:
+            data = document_xml if blob is None else blob
+            zf.writestr(name, data, compress_type=_image_compress_type(data) if name.endswith(_PRECOMPRESSED) else None)
+
+
+# Estilo de tabla con el sombreado de filas alternas definido una sola vez
+# (band2Horz = 2ª, 4ª, … fila de datos), en lugar de un <w:shd> por celda.
+TABLE_STYLE = "GridoTable"
+_TABLE_STYLE_XML = (
+    f'<w:style {nsdecls("w")} w:type="table" w:customStyle="1" w:styleId="{TABLE_STYLE}">'
+    f'<w:name w:val="{TABLE_STYLE}"/>'
+    '<w:basedOn w:val="TableGrid"/>'
+    '<w:tblPr><w:tblStyleRowBandSize w:val="1"/></w:tblPr>'
+    '<w:tblStylePr w:type="band2Horz"><w:tcPr>'
+    f'<w:shd w:val="clear" w:color="auto" w:fill="{ROW_ALT_HEX}"/>'
+    '</w:tcPr></w:tblStylePr>'
+    '</w:style>'
+)
+
+
+def ensure_table_style(doc):
+    styles = doc.styles
+    if TABLE_STYLE not in [s.name for s in styles]:
+        styles.element.append(parse_xml(_TABLE_STYLE_XML))
+
+
+def set_run_format(run, *, bold=False, color_hex=None, size_pt=None):
+    """Arma el <w:rPr> de un run recién creado directo en XML, sin pasar por `run.font`."""
+    rPr = run._r.get_or_add_rPr()
+    if bold:
+        etree.SubElement(rPr, qn("w:b"))
+    if color_hex:
+        etree.SubElement(rPr, qn("w:color")).set(qn("w:val"), color_hex)
+    if size_pt:
+        etree.SubElement(rPr, qn("w:sz")).set(qn("w:val"), str(size_pt * 2))
+
+
+def add_styled_table(doc, headers, rows, col_widths=None, header_color=DARK_BLUE_HEX):
     table = doc.add_table(rows=1 + len(rows), cols=len(headers))
     table.alignment = WD_TABLE_ALIGNMENT.CENTER
-    table.style = "Table Grid"
+    table.style = TABLE_STYLE
 
     for i, h in enumerate(headers):
         cell = table.rows[0].cells[i]
-        cell.text = h
-        for p in cell.paragraphs:
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            for run in p.runs:
-                run.bold = True
-                run.font.color.rgb = WHITE
-                run.font.size = Pt(9)
+        p = cell.paragraphs[0]
+        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        set_run_format(p.add_run(h), bold=True, color_hex=WHITE_HEX, size_pt=9)
         set_cell_shading(cell, header_color)
 
-    for r_idx, row_data in enumerate(rows):
-        for c_idx, val in enumerate(row_data):
-            cell = table.rows[1 + r_idx].cells[c_idx]
-            cell.text = str(val)
-            for p in cell.paragraphs:
-                for run in p.runs:
-                    run.font.size = Pt(9)
-            if r_idx % 2 == 1:
-                set_cell_shading(cell, "F8F9FA")
+    for row, row_data in zip(table.rows[1:], rows):
+        for cell, val in zip(row.cells, row_data):
+            set_run_format(cell.paragraphs[0].add_run(str(val)), size_pt=9)
 
     if col_widths:
         for i, w in enumerate(col_widths):
@@ -59,49 +628,114 @@ def add_styled_table(doc, headers, rows, col_widths=None, header_color="1D3557")
     return table
 
 
-def add_item_block(doc, item_id, item_name, photos, tip=None):
-    p = doc.add_paragraph()
-    run = p.add_run(f"{item_id}  ")
-    run.bold = True
-    run.font.size = Pt(11)
-    run.font.color.rgb = RED
-    run2 = p.add_run(item_name)
-    run2.bold = True
-    run2.font.size = Pt(11)
-    run2.font.color.rgb = DARK_BLUE
-    p.space_before = Pt(12)
-    p.space_after = Pt(4)
-
-    count_p = doc.add_paragraph()
-    count_run = count_p.add_run(f"Fotos a tomar ({len(photos)}):")
-    count_run.bold = True
-    count_run.font.size = Pt(9)
-    count_run.font.color.rgb = RGBColor(0x55, 0x55, 0x55)
-    count_p.space_after = Pt(2)
-
-    for i, photo in enumerate(photos, 1):
-        lp = doc.add_paragraph(style="List Number")
-        lr = lp.add_run(photo)
-        lr.font.size = Pt(9)
-        lp.space_before = Pt(0)
-        lp.space_after = Pt(1)
-        lp.paragraph_format.left_indent = Cm(1.5)
+def add_multiline_run(p, lines, size_pt, color_hex):
+    """Agrega un único <w:r> con las líneas separadas por <w:br/>, armado de una vez."""
+    text = "<w:br/>".join(f'<w:t xml:space="preserve">{escape(line)}</w:t>' for line in lines)
+    p._p.append(parse_xml(
+        f'<w:r {nsdecls("w")}><w:rPr><w:color w:val="{color_hex}"/>'
+        f'<w:sz w:val="{size_pt * 2}"/></w:rPr>{text}</w:r>'
+    ))
+
+
+def add_heading(doc, text, level):
+    return doc.add_paragraph(text, style=HEADING_STYLES[level])
+
+
+# Fragmentos XML de las partes variables (secciones A–E y tips). "{}" recibe el
+# texto ya escapado; el prefijo w: lo declara la raíz de document.xml.
+_T = '<w:t xml:space="preserve">{}</w:t>'
+_HEADING1_XML = f'<w:p><w:pPr><w:pStyle w:val="{HEADING_STYLES[1]}"/></w:pPr><w:r>{_T}</w:r></w:p>'
+_PERIODICITY_XML = (
+    f'<w:p><w:r><w:rPr><w:b/><w:color w:val="{DARK_BLUE_HEX}"/><w:sz w:val="20"/></w:rPr>{_T}</w:r></w:p>'
+)
+_ITEM_HEADER_XML = (
+    f'<w:p><w:r><w:rPr><w:b/><w:color w:val="{RED_HEX}"/><w:sz w:val="22"/></w:rPr>{_T}</w:r>'
+    f'<w:r><w:rPr><w:b/><w:color w:val="{DARK_BLUE_HEX}"/><w:sz w:val="22"/></w:rPr>{_T}</w:r></w:p>'
+)
+_COUNT_XML = f'<w:p><w:r><w:rPr><w:b/><w:color w:val="555555"/><w:sz w:val="18"/></w:rPr>{_T}</w:r></w:p>'
+_PHOTO_XML = (
+    '<w:p><w:pPr><w:pStyle w:val="ListNumber"/><w:ind w:left="850"/></w:pPr>'
+    f'<w:r><w:rPr><w:sz w:val="18"/></w:rPr>{_T}</w:r></w:p>'
+)
+_ITEM_TIP_XML = f'<w:p><w:r><w:rPr><w:i/><w:color w:val="888888"/><w:sz w:val="16"/></w:rPr>{_T}</w:r></w:p>'
+_TIP_BULLET_XML = f'<w:p><w:pPr><w:pStyle w:val="TipBullet"/></w:pPr><w:r>{_T}</w:r></w:p>'
+PAGE_BREAK_XML = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+
+def add_page_break(doc):
+    """Versión python-docx de PAGE_BREAK_XML: un único <w:p> armado de una vez."""
+    doc.element.body.sectPr.addprevious(
+        parse_xml(PAGE_BREAK_XML.replace("<w:p>", f'<w:p {nsdecls("w")}>', 1))
+    )
+
 
+def render_item(item_id, item_name, photos, tip=None):
+    """XML de un ítem; todos los textos llegan ya escapados (ver _RENDERED_SECTIONS)."""
+    parts = [
+        _ITEM_HEADER_XML.format(f"{item_id}  ", item_name),
+        _COUNT_XML.format(f"Fotos a tomar ({len(photos)}):"),
+    ]
+    parts.extend(_PHOTO_XML.format(photo) for photo in photos)
     if tip:
-        tp = doc.add_paragraph()
-        tr = tp.add_run(tip)
-        tr.italic = True
-        tr.font.size = Pt(8)
-        tr.font.color.rgb = RGBColor(0x88, 0x88, 0x88)
-        tp.space_before = Pt(2)
+        parts.append(_ITEM_TIP_XML.format(tip))
+    return "".join(parts)
+
+
+def render_section(sec_letter, sec_name, periodicity, items_xml):
+    # Las secciones se arman en secuencia sobre el mismo documento: comparten la
+    # numeración de "List Number" y son demasiado chicas para amortizar procesos.
+    return "".join((
+        _HEADING1_XML.format(f"Sección {sec_letter} — {sec_name}"),
+        _PERIODICITY_XML.format(f"PERIODICIDAD: {periodicity}"),
+        items_xml,
+        PAGE_BREAK_XML,
+    ))
+
+
+# Textos escapados para XML y bloques de ítems ya renderizados, una sola vez al
+# importar el módulo: build() solo concatena.
+_RENDERED_SECTIONS = tuple(
+    (
+        escape(sec_letter), escape(sec_name), escape(periodicity),
+        "".join(
+            render_item(escape(item_id), escape(item_name), tuple(map(escape, photos)), tip and escape(tip))
+            for item_id, item_name, photos, tip in items
+        ),
+    )
+    for sec_letter, sec_name, periodicity, items in SECTIONS_DATA
+)
+_ESCAPED_TIPS = tuple(map(escape, TIPS))
 
 
-def build():
+def render_body():
+    """XML de todo lo que va después de la portada y el plan de periodicidad."""
+    parts = [render_section(*section) for section in _RENDERED_SECTIONS]
+    parts.append(_HEADING1_XML.format("Tips para el colaborador"))
+    parts.extend(_TIP_BULLET_XML.format(t) for t in _ESCAPED_TIPS)
+    return "".join(parts)
+
+
+def _reference_document():
+    """Documento base con estilos y márgenes ya configurados (el "reference.docx")."""
     doc = Document()
 
     style = doc.styles["Normal"]
     style.font.name = "Calibri"
-    style.font.size = Pt(10)
+    style.font.size = PT10
+    ensure_table_style(doc)
+
+    # Color/tamaño fijos como estilos, en vez de formatear cada run a mano.
+    styles = doc.styles
+    for name, base, color in (
+        (HEADING_STYLES[1], "Heading 1", RED),
+        (HEADING_STYLES[2], "Heading 2", DARK_BLUE),
+    ):
+        heading = styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+        heading.base_style = styles[base]
+        heading.font.color.rgb = color
+    tip = styles.add_style("TipBullet", WD_STYLE_TYPE.PARAGRAPH)
+    tip.base_style = styles["List Bullet"]
+    tip.font.size = PT9
 
     for section in doc.sections:
         section.top_margin = Cm(1.5)
@@ -109,12 +743,16 @@ def build():
         section.left_margin = Cm(2)
         section.right_margin = Cm(2)
 
-    # ── Portada ──
-    for _ in range(4):
-        doc.add_paragraph()
+    return doc
 
+
+def _add_front_matter(doc):
+    """Portada y plan de periodicidad: idénticos en cada corrida."""
+    # ── Portada ──
+    # El aire vertical va como space_before en vez de párrafos vacíos.
     title = doc.add_paragraph()
     title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    title.paragraph_format.space_before = EMPTY_LINE * 4
     r = title.add_run("GRIDO AUDIT VISION")
     r.bold = True
     r.font.size = Pt(28)
@@ -129,29 +767,23 @@ def build():
     ref = doc.add_paragraph()
     ref.alignment = WD_ALIGN_PARAGRAPH.CENTER
     r3 = ref.add_run("Referencia: Auditorías Operativas Abril 2025")
-    r3.font.size = Pt(10)
+    r3.font.size = PT10
     r3.font.color.rgb = RGBColor(0x99, 0x99, 0x99)
 
-    for _ in range(3):
-        doc.add_paragraph()
-
     instr = doc.add_paragraph()
     instr.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    ri = instr.add_run(
-        "Para cada ítem se listan las fotos que el colaborador debe tomar.\n"
-        "Todas las fotos deben ser claras, bien iluminadas y sin filtros.\n"
-        "Nombrar cada archivo con el código del ítem + número de foto.\n"
-        "Ejemplo: A1_01.jpg, A1_02.jpg, etc."
-    )
-    ri.font.size = Pt(9)
-    ri.font.color.rgb = RGBColor(0x66, 0x66, 0x66)
+    instr.paragraph_format.space_before = EMPTY_LINE * 3
+    add_multiline_run(instr, [
+        "Para cada ítem se listan las fotos que el colaborador debe tomar.",
+        "Todas las fotos deben ser claras, bien iluminadas y sin filtros.",
+        "Nombrar cada archivo con el código del ítem + número de foto.",
+        "Ejemplo: A1_01.jpg, A1_02.jpg, etc.",
+    ], 9, TEXT_GRAY_HEX)
 
-    doc.add_page_break()
+    add_page_break(doc)
 
     # ── Plan de Periodicidad ──
-    h = doc.add_heading("Plan de Periodicidad", level=1)
-    for run in h.runs:
-        run.font.color.rgb = RED
+    add_heading(doc, "Plan de Periodicidad", 1)
 
     doc.add_paragraph(
         "La auditoría oficial comercial es cada 6 meses. "
@@ -166,14 +798,12 @@ def build():
             ["OFICIAL", "Cada 6 meses (mes 6)", "Auditoría formal de la marca", "—"],
         ],
         col_widths=[3, 5, 6, 2.5],
-        header_color="E63946",
+        header_color=RED_HEX,
     )
 
     doc.add_paragraph()
 
-    h2 = doc.add_heading("Periodicidad por sección", level=2)
-    for run in h2.runs:
-        run.font.color.rgb = DARK_BLUE
+    add_heading(doc, "Periodicidad por sección", 2)
 
     add_styled_table(doc,
         ["Sección", "Periodicidad", "Tipo de auditoría"],
@@ -193,29 +823,27 @@ def build():
         "¿Por qué la sección C es mensual? "
     )
     rw.bold = True
-    rw.font.size = Pt(9)
+    rw.font.size = PT9
     p_why.add_run(
         "Porque los ítems de operatoria diaria (higiene, manipulación, uniformes, "
         "temperaturas, almacenamiento, documentación) son los más variables y donde "
         "se concentra la mayoría de los \"No Conforme\". Revisarlos cada mes permite "
         "corregir antes de que se vuelvan hábitos."
-    ).font.size = Pt(9)
+    ).font.size = PT9
 
     p_seg = doc.add_paragraph()
     rs = p_seg.add_run("Seguimiento de desvíos: ")
     rs.bold = True
-    rs.font.size = Pt(9)
+    rs.font.size = PT9
     p_seg.add_run(
         "En la auditoría rápida (meses 1, 3 y 5), además de la sección C completa, "
         "se deben re-fotografiar TODOS los ítems que resultaron \"Observación\" o "
         "\"No Conforme\" en la auditoría anterior, sin importar a qué sección pertenezcan."
-    ).font.size = Pt(9)
+    ).font.size = PT9
 
     doc.add_paragraph()
 
-    h3 = doc.add_heading("Calendario anual sugerido", level=2)
-    for run in h3.runs:
-        run.font.color.rgb = DARK_BLUE
+    add_heading(doc, "Calendario anual sugerido", 2)
 
     add_styled_table(doc,
         ["Mes", "Tipo", "Alcance", "Fotos"],
@@ -236,474 +864,92 @@ def build():
         col_widths=[2, 3, 7, 2],
     )
 
-    doc.add_page_break()
-
-    # ── SECCIONES ──
-    sections_data = [
-        ("A", "INFRAESTRUCTURA: Estado de conservación y limpieza",
-         "Cada 2 MESES (solo en auditoría COMPLETA)", [
-            ("A.1", "Exterior (pisos, zócalos, cordón cuneta, techos, muros, iluminación, pérgolas, toldos, bicicletero, dog parking, juegos infantiles)", [
-                "Vista general de la vereda/exterior del local (desde la calle, que se vea el frente completo incluyendo pisos y cordón cuneta).",
-                "Pisos exteriores en detalle: juntas, rejillas, deck (si aplica). Acercarse para que se vean las condiciones de las piezas.",
-                "Muros y zócalos exteriores: foto de cada pared exterior visible.",
-                "Techos y cielorrasos exteriores (pérgola, toldo). Foto mirando hacia arriba desde abajo.",
-                "Bicicletero / dog parking / juegos infantiles exteriores (si existen). Una foto de cada uno mostrando estado general.",
-                "Iluminación exterior: foto de los artefactos de luz (reflectores, lámparas LED). Si es de noche, foto con luces encendidas.",
-            ], "Si hay defectos visibles (graffitis, piezas rotas, manchas), sacar foto extra en detalle."),
-            ("A.2", "Marquesina: Estado y limpieza", [
-                "Vista frontal completa de la marquesina (que se vea toda la estructura, chapas, logo corpóreo).",
-                "Detalle del logo corpóreo y su iluminación.",
-                "Cartel bandera y/o saliente (si existe). Foto lateral.",
-                "Detalle de limpieza: acercar a la marquesina para ver polvo, manchas, óxido o suciedad acumulada.",
-            ], "Si es horario nocturno: foto adicional con reflectores encendidos."),
-            ("A.3", "Mobiliario: Estado y limpieza (mesas, sillas, sombrillas, living)", [
-                "Vista general del sector de mesas y sillas (conjunto completo, orden y distribución).",
-                "Detalle de una mesa: superficie de la tapa, ploteo, estado de pintura.",
-                "Detalle de una silla: patas, regatones, estado de pintura, soldaduras.",
-                "Sombrillas (si existen): foto general mostrando estado y estabilidad.",
-                "Living (si existe): foto de sillones/tapizados mostrando estado del tapizado, lonas, estructura.",
-            ], "Si hay defectos (óxido, pinturas descascaradas, tapizados rotos): foto extra en detalle."),
-            ("A.4", "Iluminación interior: Estado y limpieza", [
-                "Vista general del salón mostrando todas las luminarias (que se aprecie si están encendidas y si la luz es suficiente).",
-                "Vista general del AMH mostrando luminarias.",
-                "Detalle de un plafón/luminaria de cerca (para ver limpieza, presencia de insectos, estado).",
-                "Foto de cualquier luminaria apagada o con defecto visible.",
-            ], None),
-            ("A.5", "Pisos, aberturas, techo y zócalos en salón: Estado y limpieza", [
-                "Pisos del salón: vista general (que se vean las juntas, estado de las piezas, zócalos).",
-                "Detalle de zócalos: acercar a la unión piso-pared.",
-                "Aberturas/puertas de ingreso: foto frontal mostrando vidrios, herrajes, estado general.",
-                "Detalle de vidrios: buscar rajaduras, falta de masilla, vinilos/fajas.",
-                "Techo/cielorraso del salón: foto mirando hacia arriba.",
-                "Alfombra de ingreso (si existe): foto de cerca mostrando estado.",
-            ], "Si hay cortina metálica: foto cuando está abierta (buscar graffitis en cara interna)."),
-            ("A.6", "Muros y revestimientos de muros en salón: Estado y limpieza", [
-                "Pared principal del salón (revestimiento nebraska, cuadros, ploteos).",
-                "Pared del AMH: cerámicos bricks, estado de juntas.",
-                "Detalle de cuadros decorativos (bien puestos, imágenes autorizadas).",
-                "Zócalos y repisas corian en unión de módulos con pared de bricks.",
-                "Cualquier pared con humedad, pintura descascarada, cerámicos rotos o faltantes (foto de detalle).",
-            ], None),
-            ("A.7", "Cartelera: Estado y limpieza", [
-                "Vista frontal completa de la cartelera (que se lean los precios y se vean todas las pantallas/láminas).",
-                "Detalle de precios: foto acercada donde se verifique que son los autorizados.",
-                "Sabores faltantes: foto mostrando si están marcados correctamente (sticker o marcación del sistema).",
-                "Estado de limpieza de la cartelera: marcos, cables, estructura.",
-            ], None),
-            ("A.8", "Mostradores: Estado y limpieza", [
-                "Vista frontal completa del mostrador (desde el lado del cliente).",
-                "Detalle de la piedra del mostrador: buscar rajaduras, roturas.",
-                "Vidrios del mostrador: estado, limpieza, fijación.",
-                "Material de comunicación exhibido en el mostrador.",
-                "Iluminación del mostrador (si aplica): foto mostrando si funciona.",
-            ], None),
-            ("A.9", "Separación de áreas / Orden y estado del depósito", [
-                "Puerta de ingreso al depósito: señalización visible.",
-                "Vista general del depósito (que se vea el orden, distribución, estanterías, tarimas).",
-                "Paredes del depósito: cerámicos, pintura, estado de juntas.",
-                "Pisos del depósito: foto de cerca mostrando uniones curvas pared-piso, estado general.",
-                "Techo/cielorraso del depósito.",
-                "Estanterías y tarimas: material, estado, separación de 5 cm respecto de la pared.",
-                "Casilleros de colaboradores (interior si es posible).",
-                "Tarima de recepción de mercadería: foto mostrando existencia y material.",
-            ], "Si existe cámara de frío: foto adicional del interior mostrando piso sanitario, estantes, burletes."),
-            ("A.10", "¿El local permite descarga eficiente de productos congelados?", [
-                "Puerta de ingreso por donde pasa el carrito/zorrita (que se aprecie el ancho).",
-                "Recorrido desde la puerta hasta el depósito (posibles obstáculos, escaleras, desniveles).",
-                "Rampa (si existe) o escaleras con su señalización.",
-                "Espacio de estacionamiento frente al local para el camión.",
-            ], None),
-            ("A.11", "¿Hay espacio disponible para descansar?", [
-                "Vista general del espacio de descanso de colaboradores.",
-                "Detalle del mobiliario (sillas/mesa) y limpieza del sector.",
-                "Foto mostrando que no hay insumos ni mobiliario almacenado en ese espacio (o foto si los hay).",
-            ], None),
-        ]),
-        ("B", "EXPERIENCIA DEL CLIENTE",
-         "Cada 2 MESES (solo en auditoría COMPLETA)", [
-            ("B.1", "Portal de Novedades, musicalización en exterior y en salón", [
-                "TV del salón encendido mostrando el portal de novedades (que se vea la pantalla y el contenido).",
-                "Equipo de música / parlantes: ubicación y estado.",
-                "Cables de conexión: foto mostrando si están ordenados u ocultos.",
-                "Vista general del salón donde se aprecie la ubicación del TV (verificar que NO esté en el AMH).",
-            ], None),
-            ("B.2", "Climatización y ventilación: Estado y limpieza", [
-                "Equipo de aire acondicionado: vista general de la unidad interior.",
-                "Detalle de rejillas y filtros del equipo (acercar para ver limpieza, polvo, suciedad).",
-                "Manguera de desagote y bidón de recolección.",
-                "Carcasa del equipo: buscar telas de araña, manchas de sarro.",
-                "Si hay equipo exterior (compresor): foto mostrando estado.",
-            ], "IMPORTANTE: si se usa calefactor, estufa o ventilador NO autorizado, fotografiar el equipo."),
-            ("B.3", "Dispenser de agua", [
-                "Dispenser completo: vista frontal mostrando ubicación en salón/AMH.",
-                "Detalle de canillas y receptáculo/rejilla de goteo.",
-                "Estado de higiene de la carcasa y bandeja inferior.",
-                "Disponibilidad de vasos junto al dispenser.",
-            ], None),
-            ("B.4", "Matafuegos, luces de emergencia, instalación eléctrica y señalética", [
-                "Matafuegos del salón: foto completa mostrando ubicación, accesibilidad y que está colgado.",
-                "Detalle de la etiqueta de carga del matafuegos (fecha de vencimiento, tipo ABC, peso).",
-                "Matafuegos del depósito (si hay otro).",
-                "Luz de emergencia del salón: foto mostrando que está enchufada.",
-                "Luz de emergencia del depósito.",
-                "Tablero eléctrico: foto mostrando tapas sanas, señalética de riesgo eléctrico, llaves térmicas y disyuntor.",
-                "Señalética de salida de emergencia.",
-                "Desniveles/escalones: foto mostrando señalización en amarillo o rojo (o la falta de ella).",
-            ], "Si hay barandas (escaleras, terrazas): foto adicional mostrando estado e instalación."),
-            ("B.5", "Baño para clientes", [
-                "Puerta del baño con señalización visible.",
-                "Vista general del interior del baño.",
-                "Inodoro: tapa completa, botón/mochila funcionando.",
-                "Lavamanos: grifería, dispenser de jabón con contenido, dispenser de toallas con contenido.",
-                "Espejo: estado, película antiestallido.",
-                "Ventiluz/extractor: estado de la tela mosquitera.",
-                "Secamanos eléctrico (si existe): enchufado y funcionando.",
-            ], "Si hay cambiador para bebés: foto adicional mostrando estado."),
-            ("B.6", "Sector de juegos infantiles", [
-                "Vista general del sector de juegos (conjunto completo, piso blando, delimitación).",
-                "Detalle de cada juego: estructura, fijaciones, pintura.",
-                "Piso blando/goma: foto de cerca mostrando que cubre toda la superficie del juego.",
-                "Estado de higiene: buscar pegotes de helado, suciedad acumulada.",
-                "Maquinitas (si existen): foto mostrando estado y funcionamiento.",
-            ], "NO APLICA si el local no tiene sector infantil."),
-            ("B.7", "SmartFran - Club Grido - Conexión y funcionamiento", [
-                "Pantalla de SmartFran / sistema loyalty mostrando que está logueado y funcionando.",
-                "Lector de tarjetas Club Grido: foto del dispositivo.",
-                "Tabla de canjes oficial impresa: foto mostrando que está exhibida y a la vista del cliente.",
-            ], None),
-            ("B.8", "APP GRIDO: Gestión del canal digital", [
-                "Material de comunicación de descarga de la APP exhibido en el local (soporte fijo).",
-                "Captura de pantalla de la APP mostrando que el local está disponible/activo en take away.",
-                "Captura de pantalla del panel de pedidos mostrando pedidos efectivos y cancelados del último mes.",
-            ], None),
-            ("B.9", "Posnet y Grido Go (tótem autogestión)", [
-                "Posnet: foto mostrando el equipo conectado y en funcionamiento.",
-                "Tótem de autogestión (si existe): vista frontal completa mostrando pantalla encendida.",
-                "Detalle del tótem: elementos completos, estado de higiene.",
-            ], "NO APLICA el tótem si el local no lo tiene."),
-            ("B.10", "Disponibilidad de Wi-Fi para el cliente", [
-                "Señalética oficial de Wi-Fi exhibida en el local.",
-                "Captura de pantalla del celular mostrando que la red Wi-Fi está disponible.",
-                "Ubicación de la señalética en contexto (que se vea dónde está colocada).",
-            ], None),
-            ("B.11", "¿Dispone de generador eléctrico?", [
-                "Generador eléctrico: vista general mostrando ubicación.",
-                "Detalle del equipo: estado, conexiones.",
-                "Si NO tiene generador: foto del tablero eléctrico general.",
-            ], None),
-        ]),
-        ("C", "OPERATORIA DIARIA",
-         "MENSUAL (en auditoría COMPLETA y RÁPIDA)", [
-            ("C.1", "Disponibilidad de productos a granel", [
-                "Vista general del pozo/mostrador de granel abierto mostrando todos los sabores disponibles.",
-                "Foto panorámica de la cartelera de sabores (para cruzar contra lo que hay en el mostrador).",
-                "Detalle de los huecos vacíos donde faltan sabores (si los hay).",
-                "Foto de sabores marcados como faltantes en la cartelera.",
-            ], None),
-            ("C.2", "Disponibilidad y exhibición de productos secos e insumos generales", [
-                "Zona de toppings: nueces, tramontana, frutilla, crispines, ensalada de frutas. Foto de conjunto.",
-                "Salsas: foto mostrando variedad disponible (500g y 120g).",
-                "Vasos, cucharitas, envases térmicos: foto del sector de insumos.",
-                "Servilleteros en el salón: foto mostrando cantidad y distribución.",
-                "Exhibidora de Grido Tops: foto frontal mostrando variedades, estado y vinilo/faja.",
-                "Grido Market: foto frontal del exhibidor mostrando productos de frente y nivel de ocupación (3/4 mínimo).",
-                "Otros exhibidores de productos temporales: foto mostrando precios autorizados.",
-            ], None),
-            ("C.3", "Condiciones de almacenamiento, fraccionamiento y rotulado", [
-                "Estantería del depósito: vista general mostrando el orden de productos (limpieza abajo, materias primas medio, envases arriba).",
-                "Productos sobre tarimas: foto que permita apreciar la altura respecto del piso (mínimo 14 cm).",
-                "Detalle de etiquetas de productos cerrados: que se lean RNE, RNPA, fecha de elaboración/vencimiento.",
-                "Sector de productos fallados/vencidos: foto de la cartelería que los identifica.",
-                "Recipientes de productos fraccionados: foto mostrando cierre hermético, estado, etiqueta (producto, marca, fechas).",
-                "Registro de productos fraccionados: foto del documento impreso o pantalla digital de los últimos 30 días.",
-                "Interior de la cámara de frío (si aplica): foto mostrando estibado.",
-            ], None),
-            ("C.4", "Equipos de frío: Higiene y mantenimiento (pozos, cámaras, freezer, exhibidora, toppinera, frigobar)", [
-                "Freezer del depósito: vista externa (ploteo, tapas, burletes).",
-                "Freezer del depósito: interior abierto (hielo acumulado, limpieza).",
-                "Pozo de frío del mostrador: vista superior abierta.",
-                "Exhibidora vertical (impulsivos): foto frontal completa mostrando ploteo, cenefa, vidrios.",
-                "Exhibidora horizontal (si existe): foto superior abierta.",
-                "Toppinera: foto mostrando estado, tapas, limpieza.",
-                "Frigobar: foto abierto mostrando interior (productos en tuppers cerrados y rotulados).",
-                "Cámara de frío (si existe): burletes de puerta, cortina sanitaria, piso sanitario.",
-            ], None),
-            ("C.5", "Temperatura de equipos de frío", [
-                "Termómetro del pozo de granel en mostrador mostrando temperatura (debe estar entre -13,5°C y -15°C).",
-                "Termómetro del freezer del depósito mostrando temperatura (debe estar a -18°C).",
-                "Termómetro de la cámara de frío (si aplica) mostrando -18°C.",
-                "Termómetro de la exhibidora de impulsivos mostrando -18°C.",
-                "Foto de helados a granel de cerca: verificar que no haya cristalización, deformación o pérdida de consistencia.",
-            ], None),
-            ("C.6", "Capacidad de frío en la franquicia", [
-                "Vista general de todos los equipos de frío del depósito (cantidad total de freezers/cámaras).",
-                "Detalle de la capacidad: foto del interior de un freezer representativo con nivel de ocupación.",
-                "Cámara de frío (si existe): vista general del interior.",
-            ], None),
-            ("C.7", "Prevención de la contaminación cruzada", [
-                "Cajas de helado a granel en el pozo: foto superior mostrando estado de las cajas (solapas, presentación, bajado).",
-                "Detalle de 2-3 latas/cajas: buscar presencia de hielo, restos de cucuruchos u otros sabores.",
-                "Interior de las cajas/baschetas: foto que muestre si están \"demasiado limpias\" (indicio de limpieza con esponja).",
-                "Colaborador atendiendo: foto mostrando manipulación correcta (cucuruchos con servilleta, térmicos por la base).",
-                "Lavamanos del AMH: foto mostrando que está accesible para lavado de manos frecuente.",
-                "Tarima sanitaria (si se está reponiendo): foto mostrando cajas fuera del freezer sobre tarima.",
-            ], None),
-            ("C.8", "Abastecimiento de agua", [
-                "Grifo del AMH: foto mostrando salida de agua fría y caliente.",
-                "Grifo del depósito: ídem.",
-                "Tanque de agua (si se tiene acceso): foto mostrando estado de limpieza.",
-                "Foto del agua corriendo: verificar que no está turbia.",
-            ], None),
-            ("C.9", "AMH (mesadas, bacha, lavabochero, grifo monocomando)", [
-                "Vista general del AMH completo (mesada, bacha, bajomesada).",
-                "Detalle de la bacha: estado, limpieza, desagüe.",
-                "Lavabochero: foto mostrando estado y limpieza del agua.",
-                "Monocomando: foto de cerca mostrando estado y funcionamiento.",
-                "Bajomesada abierto: foto mostrando interior (puertas, melamina, herrajes, ausencia de objetos personales).",
-                "Mesada: estado de la piedra, limpieza, ausencia de elementos ajenos al sector.",
-            ], None),
-            ("C.10", "Equipos de producción (licuadora, cremera, chocolatera, maq. café, bols, utensilios)", [
-                "Licuadora: foto completa mostrando vaso, base, cables.",
-                "Chocolatera: foto mostrando nivel de chocolate, tapa, cuchara.",
-                "Cremera: foto mostrando pico, estado de la rosca.",
-                "Máquina de café: foto frontal, detalle de base y desagüe.",
-                "Bols con tapa: foto mostrando estado y limpieza (incluida tapa).",
-                "Utensilios alineados: foto de las 6 paletas, 6 bocheros y 4 corvetes juntos (para contar cantidad y verificar material).",
-                "Detalle de mangos de utensilios: foto de cerca verificando que sean de acero inoxidable (no madera, no aluminio).",
-                "Termómetro de punción: foto mostrando estado y limpieza.",
-            ], None),
-            ("C.11", "Equipos complementarios (balanza, microondas, caja, PC)", [
-                "Balanza: foto mostrando visor a la vista del cliente, estado de la bandeja.",
-                "Microondas: foto frontal mostrando display, puerta, plato.",
-                "Microondas abierto: foto del interior mostrando limpieza.",
-                "Sector de caja/PC: foto mostrando orden de cables y ausencia de papeles con vista al cliente.",
-                "Vista desde el lado del cliente del sector caja: verificar que no hay papeles, notas o elementos no autorizados.",
-            ], None),
-            ("C.12", "Elementos de higiene personal (dispenser jabón y toallas en depósito y AMH)", [
-                "Dispenser de jabón en AMH: foto mostrando estado, fijación a la pared, contenido.",
-                "Dispenser de toallas en AMH: foto mostrando estado y contenido.",
-                "Dispenser de jabón en depósito: foto ídem.",
-                "Dispenser de toallas en depósito: foto ídem.",
-            ], None),
-            ("C.13", "Elementos de limpieza y desinfección. Ausencia de sustancias peligrosas", [
-                "Sector de almacenamiento de productos de limpieza: foto mostrando ubicación, cartelería, separación de materia prima.",
-                "Rejillas extendidas: foto mostrando las de cada color (blanco = AMH, amarillo = salón/exterior, otro = baño).",
-                "Esponjas: foto mostrando tipo (verificar que NO sean metálicas en AMH).",
-                "Escobillón, escoba, pala, secador, mopa: foto mostrando estado y tipo de cabo (plástico o metal forrado, NO madera).",
-                "Productos químicos: foto mostrando envases cerrados, identificados con etiqueta original.",
-                "Foto general del sector verificando que NO hay plaguicidas, venenos, nafta, solventes, insecticidas.",
-                "Generador eléctrico en depósito (si aplica): verificar que tiene cobertura.",
-            ], None),
-            ("C.14", "¿El baño de los colaboradores está en condiciones?", [
-                "Vista general del baño de colaboradores.",
-                "Paredes y pisos: buscar hongos, humedad, suciedad.",
-                "Techo: buscar telas de araña.",
-                "Ventiluz/extractor con tela mosquitera.",
-                "Insumos: papel higiénico, toalla de mano, jabón disponibles.",
-            ], None),
-            ("C.15", "Higiene y Salud del Colaborador", [
-                "Foto de cada colaborador presente de frente (cuerpo completo): verificar uniforme, cofia, pelo recogido, ausencia de adornos.",
-                "Detalle de manos de cada colaborador: uñas cortas, limpias, sin esmalte, sin anillos/pulseras.",
-                "Colaborador manipulando producto: verificar buenas prácticas (cucurucho con servilleta, sin tocar con manos).",
-                "Foto del lavamanos con jabón accesible en AMH.",
-            ], "NOTA: pedir permiso al colaborador antes de fotografiarlo."),
-            ("C.16", "Uniforme del Colaborador", [
-                "Foto de cada colaborador de cuerpo completo: verificar cofia, delantal jean, remera, pantalón jean.",
-                "Detalle del logo del uniforme (verificar que está actualizado).",
-                "Calzado: foto de los pies mostrando calzado cerrado.",
-                "Estado del uniforme: buscar roturas, remiendos, decoloración.",
-            ], None),
-            ("C.17", "Conocimiento del colaborador", [], "ESTE ÍTEM NO REQUIERE FOTOS. Se evalúa mediante pregunta verbal aleatoria al colaborador sobre productos o procedimientos. Anotar la pregunta realizada y la respuesta obtenida en un texto o audio."),
-            ("C.18", "Constancia AFIP, Inscripción Provincial, Habilitación Municipal, Carnet Sanitario y Control de plagas", [
-                "Constancia de Inscripción AFIP exhibida.",
-                "Inscripción Provincial (Ingresos Brutos) exhibida.",
-                "Habilitación Municipal exhibida.",
-                "Carnet de manipulador de alimentos de cada colaborador presente (foto de cada carnet vigente).",
-                "Certificado de desinfección exhibido (verificar que no esté vencido, con sello y firma) + formulario MIP.",
-            ], None),
-        ]),
-        ("D", "IMAGEN: Formato y Estética",
-         "Cada 2 MESES (solo en auditoría COMPLETA)", [
-            ("D.1", "Exterior: Formato (pisos, zócalos, muros, iluminación, pérgolas, toldos)", [
-                "Vista frontal completa del local desde la calle (colores de muros, techo, cajón de cortina metálica).",
-                "Pisos exteriores: material y formato (verificar contra planilla técnica).",
-                "Pérgola/toldo: foto mostrando formato y color.",
-                "Motores de aire acondicionado en fachada: ubicación correcta.",
-                "Color de muros exteriores y techos: foto que permita comparar con el color autorizado.",
-            ], None),
-            ("D.2", "Marquesina: formato", [
-                "Marquesina completa de frente: verificar logo NUEVO.",
-                "Saliente de pared: verificar imagen actualizada.",
-                "Cartel bandera (si existe): verificar si está actualizado.",
-                "Brazos reflectores: verificar que sean LED.",
-            ], None),
-            ("D.3", "Comunicación en vidriera", [
-                "Vidriera completa de frente: que se vean todos los soportes de comunicación, vinilos y microperforados.",
-                "Faja esmerilada: foto mostrando diseño y altura (90 cm del piso).",
-                "Soportes de comunicación: foto de cada uno (máximo 2 permitidos).",
-                "Puerta: foto mostrando carteles de servicio (abierto-cerrado, horarios, Club Grido, WiFi).",
-                "Cartel \"se busca personal\" (si existe): verificar ubicación en puerta por sobre la faja y formato autorizado.",
-                "Cartel Delivery (si existe): verificar diseño autorizado.",
-            ], None),
-            ("D.4", "Mobiliario exterior: formato (mesas, sillas, sombrillas, cerco)", [
-                "Vista general de mesas y sillas exteriores: verificar modelo (ONE o Río) y colores.",
-                "Detalle de una silla: verificar modelo (ONE: blanco/azul/rojo o naranja; o Río). Verificar que NO convivan rojas con naranjas.",
-                "Sombrillas: color (blancas o azules), formato según ficha.",
-                "Cerco o maceteros delimitando el sector (si aplica).",
-                "Bancos (si existen): verificar modelo (metálicos azules o madera según ficha, que NO convivan).",
-            ], "Si hay comunicación en mesas o servilleteros: foto de detalle."),
-            ("D.5", "Mobiliario interior: formato (mesas, sillas, living)", [
-                "Vista general del salón interior con mesas y sillas.",
-                "Detalle del modelo de sillas interiores (ONE o Río; que NO convivan en el mismo sector).",
-                "Barra con banquetas (si existe): verificar modelo MILO.",
-                "Living (si existe): butacón BARI con mesa ratona de madera O sillón PAMPA con mesa ratona blanca.",
-                "Verificar ausencia de bancos metálicos en el salón.",
-            ], None),
-            ("D.6", "Iluminación interior: formato", [
-                "Luminarias del AMH: verificar tipo autorizado (plafones LED, riel blanco, galponeras, bandejas) y tono (frío o neutro).",
-                "Luminarias del sitting/salón: verificar tipo y tono (cálido o neutro).",
-                "Lámparas colgantes (si existen): verificar formato autorizado.",
-                "Detalle de un artefacto de iluminación (modelo/marca).",
-            ], None),
-            ("D.7", "Pisos, aberturas, techo y zócalos en salón: Formato", [
-                "Pisos del salón: verificar material y color según planilla técnica.",
-                "Techo/cielorraso: verificar que es del mismo color que los muros.",
-                "Iluminación de la garganta del AMH: verificar luces blancas, cálidas o neutras (NO de color).",
-                "Cortinas (si existen): verificar que sean blackout, solo en sitting, de color autorizado.",
-                "Alfombra de ingreso: estado y formato actualizado.",
-            ], None),
-            ("D.8", "Muros y revestimientos en salón: formato", [
-                "Paredes del salón: verificar color autorizado.",
-                "Ploteos: foto de cada ploteo verificando que estén actualizados.",
-                "AMH: cerámicos bricks presentes y en condiciones.",
-                "Revestimiento de madera/empapelado: verificar logo actualizado (no el viejo).",
-                "Zócalos y repisas corian: presentes en la unión módulos-bricks.",
-                "Caja de durlock cubriendo rollos de cortina metálica (si aplica): verificar que es del color de los muros.",
-            ], None),
-            ("D.9", "Cartelera: formato", [
-                "Cartelera completa: verificar formato digital vigente.",
-                "TVs: verificar tamaño (43 pulgadas), alineación entre pantallas.",
-                "Foto desde la caja: verificar legibilidad de la primera lámina.",
-                "Sabores faltantes marcados en el sistema (si aplica).",
-            ], None),
-            ("D.10", "Mostradores: formato", [
-                "Mostrador completo de frente: verificar modelo nebraska/báltico.",
-                "Detalle del logo en el mostrador (verificar actualizado).",
-                "Material de comunicación en el mostrador: verificar autorizado.",
-                "Vidrios e iluminación del mostrador.",
-            ], None),
-            ("D.11", "Decoración, plantas, jardines y cestos", [
-                "Plantas del salón y exterior: estado y distribución.",
-                "Decoraciones de fecha especial (si aplica): terminación y completitud.",
-                "Cestos del salón: modelo autorizado (plástico tapa vaivén).",
-                "Cestos exteriores: modelo autorizado (chapa).",
-                "Cesto del baño: verificar modelo a pedal.",
-            ], "Si hay soporte de vereda/cartel sandwich: foto verificando que NO esté escrito a mano."),
-            ("D.12", "Sector de juegos infantiles (formato)", [
-                "Vista general del sector: empapelado que define el sector, delimitación.",
-                "Juegos: verificar estado de seguridad y formato.",
-                "Piso blando interior o césped exterior.",
-                "Maquinitas (máximo 1): verificar ubicación en sector infantil.",
-            ], "NO APLICA si el local no tiene sector infantil."),
-            ("D.13", "Circuito ingreso-compra-consumo-salida: ¿es claro y cómodo?", [
-                "Desde la puerta de entrada mirando hacia adentro: que se vea el AMH enfrentado a la puerta.",
-                "Recorrido del cliente: foto mostrando la secuencia natural desde el ingreso hacia el mostrador.",
-                "Sector de autoservicio: verificar que está antes o junto a caja.",
-                "Sector infantil: verificar que está fuera de zona de riesgo.",
-            ], None),
-            ("D.14", "¿La cantidad de puestos de trabajo y cajas es coherente?", [
-                "Vista del AMH completo mostrando la cantidad de puestos de trabajo operativos.",
-                "Sector de caja(s): foto mostrando cuántas cajas hay.",
-                "Ventana take away (si existe para delivery de alta demanda).",
-            ], None),
-            ("D.15", "¿La franquicia se encuentra ordenada?", [
-                "Vista panorámica del salón: distanciamiento entre mesas.",
-                "Identificación de sectores: infantil, living, sitting general.",
-                "Servicios complementarios implementados.",
-                "Vista general desde la puerta mostrando el orden general.",
-            ], None),
-            ("D.16", "En términos generales, ¿el local cumple con los requisitos de marca?", [
-                "Fachada completa del local desde la vereda de enfrente.",
-                "Vista panorámica interior del salón completo.",
-                "Vista panorámica del AMH completo.",
-            ], None),
-        ]),
-        ("E", "OFERTA Y STOCK",
-         "Cada 2 MESES (solo en auditoría COMPLETA)", [
-            ("E.1", "Disponibilidad y exhibición de impulsivos", [
-                "Exhibidora vertical: foto frontal completa (verificar ploteo vinilo simil acero inoxidable, productos de cara al cliente, ocupación mínima 3/4).",
-                "Exhibidora horizontal (si existe): foto superior abierta (productos de cara, cajas cerradas, canastos con sueltas).",
-                "Detalle del ploteo/vinilo: estado, marca (Mc Cal 6076).",
-                "Cenefa de la exhibidora: estado y precios autorizados.",
-                "Vinilos de promociones o señalética: estado y autorización.",
-                "Detalle de productos faltantes o espacios vacíos.",
-            ], "Verificar que NO hay pozos o freezers operativos en el salón."),
-            ("E.2", "Disponibilidad y exhibición de congelados (Frizzio)", [
-                "Exhibidora exclusiva Frizzio: foto frontal mostrando todas las familias de productos exhibidas.",
-                "Cenefa Frizzio (horizontales) o vinilo (verticales): estado y actualización.",
-                "Pieza de comunicación Frizzio en vidriera (A1) o sector caja (A5).",
-                "Precios en vinilo (verificar que NO son en papel ni a mano).",
-                "Nivel de ocupación de la exhibidora (mínimo 3/4).",
-            ], None),
-            ("E.3", "¿Posee cámara de frío?", [
-                "Cámara de frío: vista exterior mostrando puerta y ubicación.",
-                "Interior de la cámara: vista general.",
-                "Si está fuera de la franquicia: foto mostrando ubicación/acceso.",
-            ], "Si NO posee cámara de frío: 1 foto del depósito mostrando que no existe."),
-            ("E.4", "¿La cámara de frío tiene estantes?", [
-                "Interior de la cámara: foto mostrando estantes (si existen).",
-                "Palets/piso sanitario: foto de detalle.",
-                "Combinación de estantes y palets (si aplica).",
-            ], "NO APLICA si el local no tiene cámara de frío."),
-            ("E.5", "¿Cumple con capacidad de frío ideal?", [
-                "Todos los equipos de frío alineados o en vista general (para estimar capacidad total).",
-                "Etiqueta/placa de cada freezer o equipo mostrando capacidad en litros.",
-                "Interior de equipos mostrando nivel de ocupación actual.",
-            ], None),
-        ]),
-    ]
+    add_page_break(doc)
 
-    for sec_letter, sec_name, periodicity, items in sections_data:
-        h_sec = doc.add_heading(f"Sección {sec_letter} — {sec_name}", level=1)
-        for run in h_sec.runs:
-            run.font.color.rgb = RED
-
-        p_per = doc.add_paragraph()
-        rp = p_per.add_run(f"PERIODICIDAD: {periodicity}")
-        rp.bold = True
-        rp.font.size = Pt(10)
-        rp.font.color.rgb = DARK_BLUE
-        p_per.space_after = Pt(4)
-
-        for item_id, item_name, photos, tip in items:
-            add_item_block(doc, item_id, item_name, photos, tip)
-
-        doc.add_page_break()
-
-    # ── Tips para el colaborador ──
-    h_tips = doc.add_heading("Tips para el colaborador", level=1)
-    for run in h_tips.runs:
-        run.font.color.rgb = RED
-
-    tips = [
-        "Sacá las fotos con buena iluminación y sin flash directo.",
-        "No uses filtros ni editores de imagen.",
-        "Intentá que las fotos estén bien enfocadas y sin movimiento.",
-        "Nombrá cada foto con el código del ítem (A1_01, A1_02, etc.) o agrupalas en carpetas por sección (A, B, C, D, E).",
-        "Si encontrás un defecto: sacale una foto general y una de detalle.",
-        "Las fotos de documentos (carnets, certificados, registros) deben ser legibles: acercar lo suficiente para que se lean las fechas.",
-        "Las fotos de termómetros deben mostrar la lectura con claridad.",
-        "Si un ítem \"No Aplica\" a tu local, anotalo y no saques fotos.",
-        "Aprovechá el recorrido natural: empezá por afuera (A.1, A.2), entrá al salón (A.3-A.8), seguí al depósito (A.9), y luego recorré los demás ítems en orden.",
-    ]
-    for t in tips:
-        p = doc.add_paragraph(t, style="List Bullet")
-        for run in p.runs:
-            run.font.size = Pt(9)
 
-    doc.save(OUTPUT)
-    print(f"Documento generado: {OUTPUT}")
+# El esqueleto (estilos, portada, plan de periodicidad) se arma una vez por
+# proceso con python-docx. build() solo inserta el XML de render_body() antes del
+# <w:sectPr> final de document.xml y reusa tal cual el resto de las partes.
+_SKELETON = None
+
+
+def _skeleton():
+    global _SKELETON
+    if _SKELETON is None:
+        doc = _reference_document()
+        _add_front_matter(doc)
+        entries = list(_package_entries(doc))
+        document_xml = doc.part.blob
+        split = document_xml.rindex(b"<w:sectPr")
+        _SKELETON = entries, document_xml[:split], document_xml[split:]
+    return _SKELETON
+
+
+# Huella del contenido y del código que lo arma: si coincide con la guardada
+# junto al .docx, el archivo existente ya está al día.
+CONTENT_HASH = hashlib.blake2b(Path(__file__).read_bytes(), digest_size=16).hexdigest()
+
+
+def _hash_path(output):
+    return Path(f"{output}.hash")
+
+
+def is_up_to_date(output=OUTPUT):
+    hash_path = _hash_path(output)
+    return (
+        Path(output).exists()
+        and hash_path.exists()
+        and hash_path.read_text(encoding="utf-8") == CONTENT_HASH
+    )
+
+
+# El .docx es función pura del módulo: se arma una vez por proceso y las
+# siguientes llamadas solo escriben los bytes memorizados.
+_CACHED_DOCX = None
+
+
+def render_docx():
+    global _CACHED_DOCX
+    if _CACHED_DOCX is None:
+        entries, head, tail = _skeleton()
+        buf = io.BytesIO()
+        write_package(buf, entries, head + render_body().encode("utf-8") + tail)
+        _CACHED_DOCX = buf.getvalue()
+    return _CACHED_DOCX
+
+
+def build(output=OUTPUT, force=False):
+    build_many([output], force=force)
+
+
+def build_many(outputs, force=False):
+    """Genera la guía en varias rutas.
+
+    El contenido no depende de la ruta: los mismos bytes de render_docx() se
+    escriben en cada una, más barato que repartir builds entre procesos.
+    """
+    pending = [o for o in outputs if force or not is_up_to_date(o)]
+    for output in outputs:
+        if output not in pending:
+            log.info("Sin cambios: %s", output)
+    if not pending:
+        return
+
+    data = render_docx()
+    for output in pending:
+        Path(output).write_bytes(data)
+        _hash_path(output).write_text(CONTENT_HASH, encoding="utf-8")
+        log.info("Documento generado: %s", output)
 
 
 if __name__ == "__main__":
-    build()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = [a for a in sys.argv[1:] if a != "--force"]
+    if os.getenv("PROFILE"):
+        # PROFILE=1 python generar_word.py --force → perfil acumulado por función.
+        cProfile.run(
+            'build_many(args or [OUTPUT], force="--force" in sys.argv)',
+            sort="cumulative",
+        )
+    else:
+        build_many(args or [OUTPUT], force="--force" in sys.argv)
@@ -8,15 +8,23 @@ IA opcional (beta), pero la evaluación final siempre la define el auditor.
 from __future__ import annotations
 
 import base64
+import functools
+import hashlib
 import io
+import itertools
 import json
+import mimetypes
 import os
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
 import streamlit as st
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
+from PIL import Image, ImageOps
 
 from criteria import (
     CRITERIA,
@@ -98,6 +106,7 @@ div[class*="_sel"] button {
 st.markdown(_TABLET_CSS, unsafe_allow_html=True)
 
 TOTAL_ITEMS = len(CRITERIA)
+MAX_RECENT_RESULTS = 20  # tarjetas en "Ítems ya evaluados"
 DRAFT_DIR = Path(os.path.dirname(os.path.abspath(__file__))) / ".audit_drafts"
 DRAFT_DIR.mkdir(exist_ok=True)
 
@@ -147,9 +156,11 @@ def _delete_draft():
         path.unlink()
 
 
-def _get_unique_evaluated_items() -> set[str]:
-    """Return set of unique item IDs that have been evaluated in this session."""
-    return {r["criterion"]["id"] for r in st.session_state.get("results", [])}
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_item_photos(local: str, fecha: str, item_id: str) -> list[dict]:
+    """db.get_photos_for_item, cached so widget reruns don't hit MongoDB."""
+    return db.get_photos_for_item(local, fecha, item_id)
+
 
 STATUS_COLORS = {
     "Conforme": "#2ecc71",
@@ -192,6 +203,11 @@ Si la IA evaluó "Observación" pero el auditor corrigió a "No Conforme", eso \
 significa que debés ser más estricto en casos similares.\
 """
 
+PHOTO_PROMPT = (
+    "Analizá la siguiente fotografía y evaluá si el ítem está Conforme, "
+    "Observación o No Conforme. Respondé en JSON."
+)
+
 
 # ── Session state ───────────────────────────────────────────────────────
 def _init_state():
@@ -239,6 +255,8 @@ if "_pending_draft" in st.session_state:
     with col_resume:
         if st.button("▶️ Continuar auditoría", type="primary", use_container_width=True):
             st.session_state.results = draft["results"]
+            st.session_state.pop("report_rows", None)
+            st.session_state.pop("results_by_item", None)
             st.session_state.local_name = draft.get("local_name", "")
             st.session_state.audit_date = draft.get("audit_date", datetime.now().strftime("%Y-%m-%d %H:%M"))
             st.session_state.audit_finalized = False
@@ -308,11 +326,71 @@ def _advance_to_next_item():
 
 
 # ── AI analysis ─────────────────────────────────────────────────────────
-def _encode_image(uploaded_file) -> str:
-    return base64.b64encode(uploaded_file.getvalue()).decode("utf-8")
+MAX_AI_WORKERS = 8
+AI_MAX_DIM = 2048  # lado más largo que gpt-4o aprovecha con detail=high
+AI_JPEG_QUALITY = 85
+# Campos de texto del JSON de la IA, aunque el string todavía no haya cerrado.
+_PARTIAL_FIELD_RE = re.compile(r'"(status|justificacion)"\s*:\s*"((?:[^"\\]|\\.)*)')
+
+
+@st.cache_resource(show_spinner=False)
+def _openai_client(api_key: str) -> OpenAI:
+    """One client per API key, shared across reruns and worker threads.
+
+    HTTP/2 lets the parallel photo requests share one TLS connection instead
+    of opening one per worker.
+    """
+    return OpenAI(api_key=api_key, http_client=DefaultHttpxClient(http2=True))
+
+
+def _prepare_image(data: bytes) -> tuple[bytes, str | None]:
+    """Downscale/re-encode a photo for the vision API.
+
+    Returns (bytes, mime). JPEGs already within AI_MAX_DIM (e.g. the ones saved
+    by 📸 Captura) are passed through untouched with mime None; anything else
+    is resized to fit AI_MAX_DIM and re-encoded as JPEG.
+    """
+    try:
+        img = Image.open(io.BytesIO(data))
+        if img.format == "JPEG" and max(img.size) <= AI_MAX_DIM:
+            return data, None
+        # Se re-codifica sin EXIF: aplicar antes la orientación para que la
+        # foto vertical del celular no llegue acostada.
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((AI_MAX_DIM, AI_MAX_DIM), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, "JPEG", quality=AI_JPEG_QUALITY, optimize=True)
+    except Exception:
+        return data, None
+    return buf.getvalue(), "image/jpeg"
 
 
-def _build_corrections_context(corrections: list[dict]) -> str:
+# Recomendación del resultado de reserva cuando la IA no devolvió JSON válido.
+_UNPARSED_RECOMMENDATION = "No se pudo parsear la respuesta de la IA."
+
+
+@st.cache_resource(ttl=24 * 60 * 60, show_spinner=False)
+def _ai_result_cache() -> dict[tuple[str, str, str], dict]:
+    """Process-wide {(photo hash, criterion id, model): result} for the AI beta."""
+    return {}
+
+
+def _image_data_url(data: bytes, mime: str) -> str:
+    """Build the data: URL in one bytes concat and a single decode."""
+    return (f"data:{mime};base64,".encode("ascii") + base64.b64encode(data)).decode("ascii")
+
+
+def _corrections_key(corrections: list[dict]) -> tuple:
+    """Hashable form of the corrections list, for _build_corrections_context."""
+    return tuple(
+        (c["ai_status"], c["corrected_status"],
+         c.get("ai_justificacion", "—"), c.get("correction_notes", "—"))
+        for c in corrections
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _build_corrections_context(corrections: tuple) -> str:
     """Build a text block with past corrections to inject in the prompt."""
     if not corrections:
         return ""
@@ -320,66 +398,91 @@ def _build_corrections_context(corrections: list[dict]) -> str:
         "\n\n## Correcciones previas del auditor humano para este ítem\n"
         "Usá estos ejemplos como referencia para calibrar tu evaluación:\n"
     ]
-    for i, c in enumerate(corrections, 1):
+    for i, (ai_status, corrected_status, ai_just, notes) in enumerate(corrections, 1):
         lines.append(
-            f"**Ejemplo {i}:** La IA evaluó **{c['ai_status']}** pero el auditor "
-            f"corrigió a **{c['corrected_status']}**.\n"
-            f"- Justificación IA: {c.get('ai_justificacion', '—')}\n"
-            f"- Nota del auditor: {c.get('correction_notes', '—')}\n"
+            f"**Ejemplo {i}:** La IA evaluó **{ai_status}** pero el auditor "
+            f"corrigió a **{corrected_status}**.\n"
+            f"- Justificación IA: {ai_just}\n"
+            f"- Nota del auditor: {notes}\n"
         )
     return "\n".join(lines)
 
 
 def analyze_photo(
     api_key: str,
-    image_file,
+    image_data: bytes,
     criterion: dict,
     model: str = "gpt-4o",
     corrections: list[dict] | None = None,
+    photo_name: str = "",
+    placeholder=None,
 ) -> dict:
-    client = OpenAI(api_key=api_key)
-    b64 = _encode_image(image_file)
-    mime = image_file.type or "image/jpeg"
+    """Ask the model for a suggested status for one photo.
+
+    If `placeholder` (an st.empty()) is given the response is streamed into it
+    as it arrives; only do that from the main script thread.
+    """
+    client = _openai_client(api_key)
+    image_data, mime = _prepare_image(image_data)
+    mime = mime or mimetypes.guess_type(photo_name)[0] or "image/jpeg"
 
-    corrections_ctx = _build_corrections_context(corrections or [])
+    corrections_ctx = _build_corrections_context(_corrections_key(corrections or []))
 
-    user_prompt = (
+    # Todo lo que no depende de la foto va primero y sin datos variables, así
+    # el prefijo es idéntico entre fotos del mismo ítem y aprovecha el
+    # prompt caching automático de OpenAI.
+    criterion_prompt = (
         f"## Ítem a evaluar: {criterion['id']} — {criterion['name']}\n\n"
         f"**Criterios de CONFORME:**\n{criterion['conforme']}\n\n"
         f"**Criterios de OBSERVACIÓN:**\n{criterion['observacion']}\n\n"
         f"**Criterios de NO CONFORME:**\n{criterion['no_conforme']}\n\n"
-        f"{corrections_ctx}\n\n"
-        "Analizá la siguiente fotografía y evaluá si el ítem está Conforme, "
-        "Observación o No Conforme. Respondé en JSON."
+        f"{corrections_ctx}"
     )
 
-    response = client.chat.completions.create(
+    request = dict(
         model=model,
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": criterion_prompt},
             {
                 "role": "user",
                 "content": [
-                    {"type": "text", "text": user_prompt},
+                    {"type": "text", "text": PHOTO_PROMPT},
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:{mime};base64,{b64}",
+                            "url": _image_data_url(image_data, mime),
                             "detail": "high",
                         },
                     },
                 ],
             },
         ],
-        max_tokens=1000,
-        temperature=0.2,
+        # La respuesta típica ronda 200-300 tokens; json_object garantiza JSON
+        # sin fences y temperature=0 la hace reproducible (ver _ai_result_cache).
+        max_tokens=500,
+        temperature=0,
+        response_format={"type": "json_object"},
     )
 
-    raw = response.choices[0].message.content.strip()
-    if raw.startswith("```"):
-        raw = raw.split("\n", 1)[1]
-        raw = raw.rsplit("```", 1)[0]
+    if placeholder is None:
+        raw = client.chat.completions.create(**request).choices[0].message.content
+    else:
+        parts: list[str] = []
+        for chunk in client.chat.completions.create(**request, stream=True):
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                fields = dict(_PARTIAL_FIELD_RE.findall("".join(parts)))
+                if "status" in fields:
+                    placeholder.markdown(
+                        f"{_status_badge(fields['status'])} "
+                        f"{fields.get('justificacion', '')}",
+                        unsafe_allow_html=True,
+                    )
+        placeholder.empty()
+        raw = "".join(parts)
 
+    raw = raw.strip()
     try:
         return json.loads(raw)
     except json.JSONDecodeError:
@@ -387,12 +490,73 @@ def analyze_photo(
             "status": "Observación",
             "justificacion": raw,
             "detalles_observados": [],
-            "recomendaciones": ["No se pudo parsear la respuesta de la IA."],
+            "recomendaciones": [_UNPARSED_RECOMMENDATION],
         }
 
 
+def analyze_photos(
+    api_key: str,
+    photos: list[tuple[str, bytes]],
+    criterion: dict,
+    model: str = "gpt-4o",
+    placeholder=None,
+) -> list[dict | Exception]:
+    """Run analyze_photo for several photos concurrently.
+
+    `photos` holds (photo_name, image bytes) pairs. The work is I/O-bound on
+    the API, so threads are enough. Photos already analyzed for the same
+    criterion and model are answered from _ai_result_cache() without an API
+    call; replies that could not be parsed are not cached, so re-analyzing
+    retries them. When a single photo is left it runs on the calling thread and, with
+    `placeholder`, streams its answer. Results keep the order of `photos`; a
+    failed call yields its exception instead of a dict so the caller can
+    report it from the main (Streamlit) thread.
+    """
+    cache = _ai_result_cache()
+    keys = [
+        (hashlib.blake2b(data, digest_size=16).hexdigest(), criterion["id"], model)
+        for _, data in photos
+    ]
+    pending = [i for i, key in enumerate(keys) if key not in cache]
+    results: list[dict | Exception] = [cache.get(key) for key in keys]
+
+    def _remember(i: int, result: dict) -> dict:
+        if result.get("recomendaciones") != [_UNPARSED_RECOMMENDATION]:
+            cache[keys[i]] = result
+        return result
+
+    if len(pending) == 1:
+        i = pending[0]
+        try:
+            results[i] = _remember(i, analyze_photo(
+                api_key, photos[i][1], criterion, model,
+                photo_name=photos[i][0], placeholder=placeholder,
+            ))
+        except Exception as exc:
+            results[i] = exc
+    elif pending:
+        with ThreadPoolExecutor(max_workers=min(MAX_AI_WORKERS, len(pending))) as pool:
+            futures = {
+                i: pool.submit(
+                    analyze_photo, api_key, photos[i][1], criterion, model,
+                    photo_name=photos[i][0],
+                )
+                for i in pending
+            }
+        for i, fut in futures.items():
+            try:
+                results[i] = _remember(i, fut.result())
+            except Exception as exc:
+                results[i] = exc
+    return results
+
+
 # ── UI helpers ──────────────────────────────────────────────────────────
 def _status_badge(status: str) -> str:
+    return _STATUS_BADGES.get(status) or _badge_html(status)
+
+
+def _badge_html(status: str) -> str:
     color = STATUS_COLORS.get(status, "#95a5a6")
     icon = STATUS_ICONS.get(status, "❔")
     return (
@@ -402,35 +566,50 @@ def _status_badge(status: str) -> str:
     )
 
 
+_STATUS_BADGES = {status: _badge_html(status) for status in STATUS_COLORS}
+
+# Encabezados de la guía de criterios (campo del criterio, HTML del encabezado).
+_CRITERIA_HEADERS = tuple(
+    (
+        field,
+        f"<div style='background:{STATUS_COLORS[status]};color:white;padding:8px 12px;"
+        f"border-radius:8px;font-weight:600;text-align:center;'>{status.upper()}</div>",
+    )
+    for field, status in (
+        ("conforme", "Conforme"),
+        ("observacion", "Observación"),
+        ("no_conforme", "No Conforme"),
+    )
+)
+
+
+def _html_list(title: str, items: list[str]) -> str:
+    if not items:
+        return ""
+    bullets = "".join(f"<li>{item}</li>" for item in items)
+    return f"<div style='flex:1;'><strong>{title}</strong><ul>{bullets}</ul></div>"
+
+
 def _render_result(result: dict, criterion: dict, idx: int):
+    """Render one result card with a single st.markdown call."""
     status = result.get("status", "Observación")
     color = STATUS_COLORS.get(status, "#95a5a6")
 
+    lists = (
+        _html_list("Detalles observados:", result.get("detalles_observados", []))
+        + _html_list("Recomendaciones:", result.get("recomendaciones", []))
+    )
     st.markdown(
         f"<div style='border-left:4px solid {color};padding:12px 16px;"
         f"margin-bottom:16px;background:#fafafa;border-radius:4px;'>"
         f"<h4 style='margin:0 0 8px 0;'>{criterion['id']} — {criterion['name']} "
         f"{_status_badge(status)}</h4>"
         f"<p><strong>Justificación:</strong> {result.get('justificacion', '—')}</p>"
-        "</div>",
+        + (f"<div style='display:flex;gap:24px;'>{lists}</div>" if lists else "")
+        + "</div>",
         unsafe_allow_html=True,
     )
 
-    details = result.get("detalles_observados", [])
-    recs = result.get("recomendaciones", [])
-
-    col1, col2 = st.columns(2)
-    with col1:
-        if details:
-            st.markdown("**Detalles observados:**")
-            for d in details:
-                st.markdown(f"- {d}")
-    with col2:
-        if recs:
-            st.markdown("**Recomendaciones:**")
-            for r in recs:
-                st.markdown(f"- {r}")
-
 
 _STATUS_SEVERITY = {"Conforme": 0, "Observación": 1, "No Conforme": 2}
 
@@ -440,42 +619,116 @@ def _worst_status(statuses: list[str]) -> str:
     return max(statuses, key=lambda s: _STATUS_SEVERITY.get(s, 1))
 
 
+def _merge_report_row(items: dict[str, dict], r: dict) -> None:
+    """Fold one session result into the per-item report rows (worst status wins)."""
+    item_id = r["criterion"]["id"]
+    status = r["result"]["status"]
+    if item_id not in items:
+        items[item_id] = {
+            "Ítem": item_id,
+            "Nombre": r["criterion"]["name"],
+            "Sección": get_section_name(r["criterion"]["section"]),
+            "Estado": status,
+            "Justificación": r["result"].get("justificacion", ""),
+            "Detalles": "; ".join(r["result"].get("detalles_observados", [])),
+            "Recomendaciones": "; ".join(r["result"].get("recomendaciones", [])),
+            "Fotos": 1,
+            "Fecha": r.get("timestamp", ""),
+        }
+    else:
+        prev = items[item_id]
+        prev["Fotos"] += 1
+        if _STATUS_SEVERITY.get(status, 1) > _STATUS_SEVERITY.get(prev["Estado"], 1):
+            prev["Estado"] = status
+            prev["Justificación"] = r["result"].get("justificacion", "")
+            prev["Detalles"] = "; ".join(r["result"].get("detalles_observados", []))
+            prev["Recomendaciones"] = "; ".join(r["result"].get("recomendaciones", []))
+
+
+def _results_by_item() -> dict[str, list[int]]:
+    """{criterion id: indices into st.session_state.results}, built lazily."""
+    if "results_by_item" not in st.session_state:
+        index: dict[str, list[int]] = {}
+        for i, r in enumerate(st.session_state.results):
+            index.setdefault(r["criterion"]["id"], []).append(i)
+        st.session_state.results_by_item = index
+    return st.session_state.results_by_item
+
+
+def _append_result(entry: dict) -> None:
+    """Append a session result, keeping the report rows and item index in sync."""
+    st.session_state.results.append(entry)
+    if "report_rows" in st.session_state:
+        _merge_report_row(st.session_state.report_rows, entry)
+    if "results_by_item" in st.session_state:
+        st.session_state.results_by_item.setdefault(entry["criterion"]["id"], []).append(
+            len(st.session_state.results) - 1
+        )
+
+
 def _build_report_df() -> pd.DataFrame:
-    """Build a consolidated report: one row per item, worst status wins."""
+    """Build a consolidated report: one row per item, worst status wins.
+
+    Rows are kept in st.session_state.report_rows and updated as results are
+    appended; anything that replaces or drops results pops that key so the
+    rows are rebuilt here on the next read.
+    """
+    if "report_rows" not in st.session_state:
+        items: dict[str, dict] = {}
+        for r in st.session_state.results:
+            _merge_report_row(items, r)
+        st.session_state.report_rows = items
+    return pd.DataFrame(list(st.session_state.report_rows.values()))
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_audit_history() -> list[dict]:
+    return db.get_audit_history()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _build_db_report_df(local: str, fecha: str) -> pd.DataFrame:
+    """Same consolidation as _build_report_df, for an audit stored in MongoDB."""
     items: dict[str, dict] = {}
-    for r in st.session_state.results:
-        item_id = r["criterion"]["id"]
-        status = r["result"]["status"]
+    for r in db.get_audit_results(local, fecha):
+        item_id = r["item_id"]
+        status = r["status"]
         if item_id not in items:
             items[item_id] = {
                 "Ítem": item_id,
-                "Nombre": r["criterion"]["name"],
-                "Sección": get_section_name(r["criterion"]["section"]),
+                "Nombre": r.get("item_name", ""),
+                "Sección": get_section_name(r.get("section", "")),
                 "Estado": status,
-                "Justificación": r["result"].get("justificacion", ""),
-                "Detalles": "; ".join(r["result"].get("detalles_observados", [])),
-                "Recomendaciones": "; ".join(r["result"].get("recomendaciones", [])),
+                "Justificación": r.get("justificacion", ""),
+                "Detalles": "; ".join(r.get("detalles_observados", [])),
+                "Recomendaciones": "; ".join(r.get("recomendaciones", [])),
                 "Fotos": 1,
-                "Fecha": r.get("timestamp", ""),
+                "Fecha": r.get("analyzed_at", ""),
             }
         else:
             prev = items[item_id]
             prev["Fotos"] += 1
             if _STATUS_SEVERITY.get(status, 1) > _STATUS_SEVERITY.get(prev["Estado"], 1):
                 prev["Estado"] = status
-                prev["Justificación"] = r["result"].get("justificacion", "")
-                prev["Detalles"] = "; ".join(r["result"].get("detalles_observados", []))
-                prev["Recomendaciones"] = "; ".join(r["result"].get("recomendaciones", []))
+                prev["Justificación"] = r.get("justificacion", "")
+                prev["Detalles"] = "; ".join(r.get("detalles_observados", []))
+                prev["Recomendaciones"] = "; ".join(r.get("recomendaciones", []))
     return pd.DataFrame(list(items.values()))
 
 
+@st.cache_data(show_spinner=False)
 def _to_excel(df: pd.DataFrame) -> bytes:
     buf = io.BytesIO()
-    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+    with pd.ExcelWriter(buf, engine="xlsxwriter") as writer:
         df.to_excel(writer, index=False, sheet_name="Auditoría")
     return buf.getvalue()
 
 
+@st.cache_data(show_spinner=False)
+def _to_csv(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+
 # ── Sidebar ─────────────────────────────────────────────────────────────
 with st.sidebar:
     st.caption("Auditoría interna — evaluación manual")
@@ -528,32 +781,24 @@ with st.sidebar:
     selected_criterion = get_criterion_by_id(criterion_id)
 
     st.divider()
-    evaluated_ids = _get_unique_evaluated_items()
-    n_evaluated = len(evaluated_ids)
-    total_photos = len(st.session_state.results)
-    obs_ids = set()
-    nc_ids = set()
-    conf_ids = set()
+    # Una sola pasada: estado más severo por ítem, después se cuentan.
+    item_severity: dict[str, int] = {}
     for r in st.session_state.results:
         item_id = r["criterion"]["id"]
-        status = r["result"]["status"]
-        if status == "No Conforme":
-            nc_ids.add(item_id)
-        elif status == "Observación":
-            obs_ids.add(item_id)
-        else:
-            conf_ids.add(item_id)
-    nc_ids_final = nc_ids
-    obs_ids_final = obs_ids - nc_ids
-    conf_ids_final = conf_ids - nc_ids - obs_ids
+        sev = _STATUS_SEVERITY.get(r["result"]["status"], 0)
+        if sev >= item_severity.get(item_id, 0):
+            item_severity[item_id] = sev
+    severity_counts = Counter(item_severity.values())
+    n_evaluated = len(item_severity)
+    total_photos = len(st.session_state.results)
 
     st.markdown(f"**Progreso: {n_evaluated}/{TOTAL_ITEMS} ítems**")
     st.progress(n_evaluated / TOTAL_ITEMS if TOTAL_ITEMS > 0 else 0)
 
     cols = st.columns(3)
-    cols[0].metric("✅", len(conf_ids_final))
-    cols[1].metric("⚠️", len(obs_ids_final))
-    cols[2].metric("❌", len(nc_ids_final))
+    cols[0].metric("✅", severity_counts[0])
+    cols[1].metric("⚠️", severity_counts[1])
+    cols[2].metric("❌", severity_counts[2])
 
     if total_photos > 0:
         st.caption(f"📷 {total_photos} foto(s) analizadas en total")
@@ -611,6 +856,8 @@ with st.sidebar:
     if st.button("🔄 Resetear auditoría", use_container_width=True, type="secondary"):
         _delete_draft()
         st.session_state.results = []
+        st.session_state.pop("report_rows", None)
+        st.session_state.pop("results_by_item", None)
         st.session_state.audit_date = datetime.now().strftime("%Y-%m-%d %H:%M")
         st.session_state.audit_finalized = False
         st.session_state.draft_checked = True
@@ -628,28 +875,10 @@ with tab_audit:
     st.caption(f"Check {selected_criterion['check']} · Sección {section}: {SECTIONS[section]}")
 
     with st.expander("📖 Ver criterios de evaluación", expanded=False):
-        c1, c2, c3 = st.columns(3)
-        with c1:
-            st.markdown(
-                "<div style='background:#2ecc71;color:white;padding:8px 12px;"
-                "border-radius:8px;font-weight:600;text-align:center;'>CONFORME</div>",
-                unsafe_allow_html=True,
-            )
-            st.markdown(selected_criterion["conforme"] or "_Sin criterio específico_")
-        with c2:
-            st.markdown(
-                "<div style='background:#f39c12;color:white;padding:8px 12px;"
-                "border-radius:8px;font-weight:600;text-align:center;'>OBSERVACIÓN</div>",
-                unsafe_allow_html=True,
-            )
-            st.markdown(selected_criterion["observacion"] or "_Sin criterio específico_")
-        with c3:
-            st.markdown(
-                "<div style='background:#e74c3c;color:white;padding:8px 12px;"
-                "border-radius:8px;font-weight:600;text-align:center;'>NO CONFORME</div>",
-                unsafe_allow_html=True,
-            )
-            st.markdown(selected_criterion["no_conforme"] or "_Sin criterio específico_")
+        for col, (field, header) in zip(st.columns(3), _CRITERIA_HEADERS):
+            with col:
+                st.markdown(header, unsafe_allow_html=True)
+                st.markdown(selected_criterion[field] or "_Sin criterio específico_")
 
     st.divider()
 
@@ -672,9 +901,8 @@ with tab_audit:
             if _current_crit_nav in _crit_ids_nav else False
         )
 
-    _evaluated_ids = _get_unique_evaluated_items()
     _total_nav = len(CRITERIA)
-    _done_nav = len(_evaluated_ids)
+    _done_nav = n_evaluated
     st.progress(
         _done_nav / _total_nav if _total_nav else 0,
         text=f"**{_done_nav} / {_total_nav}** ítems evaluados",
@@ -707,7 +935,7 @@ with tab_audit:
     db_photos = []
     if db.is_connected() and local_name:
         fecha_audit = datetime.now().strftime("%Y-%m")
-        db_photos = db.get_photos_for_item(local_name, fecha_audit, criterion_id)
+        db_photos = _get_item_photos(local_name, fecha_audit, criterion_id)
 
     if db_photos:
         st.markdown(
@@ -741,10 +969,8 @@ with tab_audit:
     # ── Evaluación manual ───────────────────────────────────────────
     st.subheader("✍️ Evaluación")
 
-    existing_idx = next(
-        (i for i, r in enumerate(st.session_state.results) if r["criterion"]["id"] == criterion_id),
-        None,
-    )
+    _item_indices = _results_by_item().get(criterion_id, [])
+    existing_idx = _item_indices[0] if _item_indices else None
 
     # Si se aceptó una sugerencia de IA (ver más abajo), precargar los widgets
     # ANTES de instanciarlos — Streamlit no permite tocar el session_state de
@@ -829,8 +1055,9 @@ with tab_audit:
         }
         if existing_idx is not None:
             st.session_state.results[existing_idx] = entry
+            st.session_state.pop("report_rows", None)
         else:
-            st.session_state.results.append(entry)
+            _append_result(entry)
         _save_draft()
 
         if db.is_connected() and local_name:
@@ -845,6 +1072,8 @@ with tab_audit:
                     filename=entry["filename"],
                     model="manual",
                 )
+                _get_audit_history.clear()
+                _build_db_report_df.clear()
             except Exception as e:
                 st.warning(f"No se pudo guardar el resultado en MongoDB: {e}")
 
@@ -929,30 +1158,45 @@ with tab_audit:
             "Modelo de IA", ["gpt-4o", "gpt-4o-mini"], key="beta_model"
         )
 
-        beta_photo = db_photos[0] if db_photos else None
-        beta_upload = uploaded_files[0] if uploaded_files else None
-        suggest_disabled = not beta_api_key or not (beta_photo or beta_upload)
+        suggest_disabled = not beta_api_key or not (db_photos or uploaded_files)
+        analyze_all = False
+        if len(all_photo_names) > 1:
+            # Por defecto se analiza solo la primera foto (una consulta a la API);
+            # analizar todas hace una consulta por foto.
+            analyze_all = st.checkbox(
+                f"Analizar las {len(all_photo_names)} fotos",
+                key=f"beta_all_{criterion_id}",
+                help=(
+                    f"Hace {len(all_photo_names)} consultas a la API en paralelo (una por foto) "
+                    "y sugiere el estado más severo. Sin marcar, se analiza solo la primera foto."
+                ),
+            )
 
         if st.button("🔍 Pedir sugerencia IA", disabled=suggest_disabled, key=f"beta_suggest_{criterion_id}"):
-            try:
-                if beta_photo:
-                    img_file = io.BytesIO(beta_photo["photo_data"])
-                    img_file.name = beta_photo["photo_name"]
-                    img_file.type = "image/jpeg"
-                    img_file.getvalue = lambda d=beta_photo["photo_data"]: d
+            ai_photos = [(p["photo_name"], p["photo_data"]) for p in db_photos]
+            ai_photos += [(f.name, f.getvalue()) for f in (uploaded_files or [])]
+            if not analyze_all:
+                ai_photos = ai_photos[:1]
+
+            with st.spinner("Consultando IA..."):
+                ai_results = analyze_photos(
+                    api_key=beta_api_key,
+                    photos=ai_photos,
+                    criterion=selected_criterion,
+                    model=beta_model,
+                    placeholder=st.empty(),
+                )
+            ok_results = []
+            for (photo_name, _), res in zip(ai_photos, ai_results):
+                if isinstance(res, Exception):
+                    st.error(f"Error al consultar la IA ({photo_name}): {res}")
                 else:
-                    img_file = beta_upload
-
-                with st.spinner("Consultando IA..."):
-                    ai_result = analyze_photo(
-                        api_key=beta_api_key,
-                        image_file=img_file,
-                        criterion=selected_criterion,
-                        model=beta_model,
-                    )
-                st.session_state[f"beta_result_{criterion_id}"] = ai_result
-            except Exception as exc:
-                st.error(f"Error al consultar la IA: {exc}")
+                    ok_results.append(res)
+            if ok_results:
+                st.session_state[f"beta_result_{criterion_id}"] = max(
+                    ok_results,
+                    key=lambda r: _STATUS_SEVERITY.get(r.get("status", "Observación"), 1),
+                )
 
         _beta_result = st.session_state.get(f"beta_result_{criterion_id}")
         if _beta_result:
@@ -962,12 +1206,23 @@ with tab_audit:
                 st.rerun()
 
     # ── Ítems ya evaluados ────────────────────────────────────────────
-    other_results = [r for r in st.session_state.results if r["criterion"]["id"] != criterion_id]
-    if other_results:
+    n_other = len(st.session_state.results) - len(_results_by_item().get(criterion_id, []))
+    if n_other:
         st.divider()
-        with st.expander(f"📋 Ítems ya evaluados ({len(other_results)})", expanded=False):
-            for entry in reversed(other_results):
+        # Un expander ejecuta su contenido aunque esté cerrado: con un toggle
+        # los resultados solo se arman cuando se piden.
+        if st.toggle(f"📋 Ítems ya evaluados ({n_other})", key="aud_show_other_results"):
+            recent = (
+                entry for entry in reversed(st.session_state.results)
+                if entry["criterion"]["id"] != criterion_id
+            )
+            for entry in itertools.islice(recent, MAX_RECENT_RESULTS):
                 _render_result(entry["result"], entry["criterion"], 0)
+            if n_other > MAX_RECENT_RESULTS:
+                st.caption(
+                    f"Se muestran los últimos {MAX_RECENT_RESULTS}; "
+                    "el detalle completo está en 📊 Reporte."
+                )
 
     # ── Navegación wizard inferior ─────────────────────────────────
     st.divider()
@@ -997,10 +1252,10 @@ with tab_report:
     st.header("📊 Reporte de Auditoría")
 
     report_source = "session"
-    db_report_results = []
+    db_df = None
 
     if db.is_connected():
-        history = db.get_audit_history()
+        history = _get_audit_history()
         if history:
             audit_options = [f"{h['local']} — {h['fecha']}" for h in history]
             audit_options.insert(0, "Sesión actual")
@@ -1008,35 +1263,11 @@ with tab_report:
             if selected_audit != "Sesión actual":
                 idx = audit_options.index(selected_audit) - 1
                 sel = history[idx]
-                db_report_results = db.get_audit_results(sel["local"], sel["fecha"])
+                db_df = _build_db_report_df(sel["local"], sel["fecha"])
                 report_source = "db"
 
-    if report_source == "db" and db_report_results:
-        items_db: dict[str, dict] = {}
-        for r in db_report_results:
-            item_id = r["item_id"]
-            status = r["status"]
-            if item_id not in items_db:
-                items_db[item_id] = {
-                    "Ítem": item_id,
-                    "Nombre": r.get("item_name", ""),
-                    "Sección": get_section_name(r.get("section", "")),
-                    "Estado": status,
-                    "Justificación": r.get("justificacion", ""),
-                    "Detalles": "; ".join(r.get("detalles_observados", [])),
-                    "Recomendaciones": "; ".join(r.get("recomendaciones", [])),
-                    "Fotos": 1,
-                    "Fecha": r.get("analyzed_at", ""),
-                }
-            else:
-                prev = items_db[item_id]
-                prev["Fotos"] += 1
-                if _STATUS_SEVERITY.get(status, 1) > _STATUS_SEVERITY.get(prev["Estado"], 1):
-                    prev["Estado"] = status
-                    prev["Justificación"] = r.get("justificacion", "")
-                    prev["Detalles"] = "; ".join(r.get("detalles_observados", []))
-                    prev["Recomendaciones"] = "; ".join(r.get("recomendaciones", []))
-        df = pd.DataFrame(list(items_db.values()))
+    if report_source == "db" and not db_df.empty:
+        df = db_df
 
         sel_h = history[audit_options.index(selected_audit) - 1]
         st.markdown(
@@ -1071,7 +1302,7 @@ with tab_report:
                 "E": "#F5841F",
             }
 
-            if report_source == "db" and db_report_results:
+            if report_source == "db" and not db_df.empty:
                 _chart_local = sel_h["local"]
                 _chart_fecha = sel_h["fecha"]
             else:
@@ -1137,12 +1368,15 @@ with tab_report:
                 st.metric("Cobertura", f"{unique_items}/{total_items} ítems")
 
         with summary_col2:
+            sec_stats = (
+                (df["Estado"] == "Conforme")
+                .groupby(df["Sección"])
+                .agg(["sum", "size"])
+            )
             for sec_key, sec_name in SECTIONS.items():
-                sec_results = df[df["Sección"] == sec_name]
-                if sec_results.empty:
+                if sec_name not in sec_stats.index:
                     continue
-                sec_conformes = (sec_results["Estado"] == "Conforme").sum()
-                sec_total = len(sec_results)
+                sec_conformes, sec_total = sec_stats.loc[sec_name]
                 pct = sec_conformes / sec_total * 100 if sec_total else 0
                 st.markdown(
                     f"**{sec_key}. {sec_name}** — {sec_conformes}/{sec_total} conformes ({pct:.0f}%)"
@@ -1163,19 +1397,18 @@ with tab_report:
         st.divider()
         col_dl1, col_dl2 = st.columns(2)
         with col_dl1:
-            excel_bytes = _to_excel(df)
+            # Los archivos se generan recién al hacer clic, no en cada rerun.
             st.download_button(
                 "📥 Descargar Excel",
-                data=excel_bytes,
+                data=functools.partial(_to_excel, df),
                 file_name=f"auditoria_grido_{datetime.now():%Y%m%d_%H%M}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True,
             )
         with col_dl2:
-            csv_data = df.to_csv(index=False).encode("utf-8")
             st.download_button(
                 "📥 Descargar CSV",
-                data=csv_data,
+                data=functools.partial(_to_csv, df),
                 file_name=f"auditoria_grido_{datetime.now():%Y%m%d_%H%M}.csv",
                 mime="text/csv",
                 use_container_width=True,
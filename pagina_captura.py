@@ -6,8 +6,10 @@ para el mismo ítem, el estado Conforme/Observación/No Conforme.
 
 from __future__ import annotations
 
+import functools
 import io
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 
 import streamlit as st
@@ -20,6 +22,11 @@ import db
 
 MAX_DIM = 1200
 JPEG_QUALITY = 80
+MAX_COMPRESS_WORKERS = 8
+# Un JPEG que ya está dentro de MAX_DIM y de este tamaño se guarda tal cual.
+MAX_PASSTHROUGH_BYTES = 400 * 1024
+THUMB_DIM = 320
+THUMB_QUALITY = 60
 
 NO_PHOTO_ITEMS = {"C.17"}
 
@@ -46,6 +53,12 @@ SECTION_SHORT = {
     "E": "Stock",
 }
 
+# "A.1" → "A1" (prefijo de nombre de foto) y "A_Infraestructura/A1" (carpeta en el ZIP)
+_ITEM_CODE = {c["id"]: c["id"].replace(".", "") for c in CRITERIA}
+_ITEM_FOLDER = {
+    c["id"]: f"{SECTION_FOLDERS[c['section']]}/{_ITEM_CODE[c['id']]}" for c in CRITERIA
+}
+
 # ── CSS ───────────────────────────────────────────────────────────────────
 
 st.markdown(
@@ -134,6 +147,9 @@ div[class*="_sel"] button {
 
 if "cap_photos" not in st.session_state:
     st.session_state.cap_photos: dict[str, list[dict]] = {}
+# Se incrementa en cada alta/baja de fotos de sesión; invalida el ZIP cacheado.
+if "cap_photos_version" not in st.session_state:
+    st.session_state.cap_photos_version = 0
 
 use_mongo = db.is_connected()
 
@@ -148,24 +164,47 @@ def compress_photo(uploaded_file) -> bytes:
     except Exception:
         return uploaded_file.getvalue()
 
+    # Fast path (típico de st.camera_input): ya es un JPEG chico, no hace
+    # falta decodificarlo ni re-codificarlo.
+    if img.format == "JPEG" and img.mode in ("RGB", "L") and max(img.size) <= MAX_DIM:
+        raw = uploaded_file.getvalue()
+        if len(raw) <= MAX_PASSTHROUGH_BYTES:
+            return raw
+
+    # Para JPEG, libjpeg puede decodificar directo a 1/2, 1/4 u 1/8 de la
+    # resolución (escalado en el dominio DCT) sin bajar de MAX_DIM.
+    if img.format == "JPEG":
+        img.draft("RGB", (MAX_DIM, MAX_DIM))
+
     if img.mode in ("RGBA", "P"):
         img = img.convert("RGB")
 
     w, h = img.size
     if max(w, h) > MAX_DIM:
         ratio = MAX_DIM / max(w, h)
-        img = img.resize((int(w * ratio), int(h * ratio)), Image.LANCZOS)
+        img = img.resize((int(w * ratio), int(h * ratio)), Image.BILINEAR)
 
     buf = io.BytesIO()
-    img.save(buf, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    img.save(buf, "JPEG", quality=JPEG_QUALITY)
     return buf.getvalue()
 
 
-def _photo_count(local: str, fecha: str, item_id: str) -> int:
-    if use_mongo:
-        counts = _get_counts(local, fecha)
-        return counts.get(item_id, 0)
-    return len(st.session_state.cap_photos.get(item_id, []))
+def make_thumb(photo_data: bytes) -> bytes:
+    """Return a small JPEG preview of already-compressed photo bytes."""
+    try:
+        img = Image.open(io.BytesIO(photo_data))
+        img.draft("RGB", (THUMB_DIM, THUMB_DIM))
+        img.thumbnail((THUMB_DIM, THUMB_DIM))
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, "JPEG", quality=THUMB_QUALITY)
+        return buf.getvalue()
+    except Exception:
+        return photo_data
+
+
+def _compress_with_thumb(uploaded_file) -> tuple[bytes, bytes]:
+    compressed = compress_photo(uploaded_file)
+    return compressed, make_thumb(compressed)
 
 
 @st.cache_data(ttl=5)
@@ -173,64 +212,127 @@ def _get_counts(local: str, fecha: str) -> dict[str, int]:
     return db.get_photo_counts(local, fecha)
 
 
-def _total_photos(local: str, fecha: str) -> int:
+@st.cache_resource(ttl=5 * 60, show_spinner=False)
+def _thumb_cache() -> dict[tuple[str, str, str], tuple[int, list[dict]]]:
+    """{(local, fecha, item_id): (cantidad de fotos, miniaturas)} compartido entre reruns y sesiones."""
+    return {}
+
+
+def _get_item_thumbs(local: str, fecha: str, item_id: str, count: int) -> list[dict]:
+    """Miniaturas del ítem; se releen si cambió `count` (p. ej. fotos subidas o
+    borradas desde otra sesión o proceso) y, como mucho, cada 5 minutos."""
+    cache = _thumb_cache()
+    key = (local, fecha, item_id)
+    entry = cache.get(key)
+    if entry is None or entry[0] != count:
+        entry = (count, db.get_photo_thumbs_for_item(local, fecha, item_id))
+        cache[key] = entry
+    return entry[1]
+
+
+def _photo_counts(local: str, fecha: str) -> dict[str, int]:
+    """Devuelve {item_id: cantidad de fotos} del backend activo."""
     if use_mongo:
-        return sum(_get_counts(local, fecha).values())
-    return sum(len(v) for v in st.session_state.cap_photos.values())
+        return _get_counts(local, fecha)
+    return {k: len(v) for k, v in st.session_state.cap_photos.items()}
 
 
-def _total_size_str(local: str, fecha: str) -> str:
+def _total_size_bytes(local: str, fecha: str) -> int:
     if use_mongo:
-        total = db.get_total_size(local, fecha)
-    else:
-        total = sum(
-            len(p["data"])
-            for photos in st.session_state.cap_photos.values()
-            for p in photos
-        )
+        return db.get_total_size(local, fecha)
+    return sum(
+        len(p["data"])
+        for photos in st.session_state.cap_photos.values()
+        for p in photos
+    )
+
+
+def _size_str(total: int) -> str:
     if total < 1024 * 1024:
         return f"{total / 1024:.0f} KB"
     return f"{total / (1024 * 1024):.1f} MB"
 
 
-def _build_zip(local: str, fecha: str) -> bytes:
+def _item_folder(item_id: str) -> str:
+    # Fotos viejas pueden tener ítems que ya no están en CRITERIA.
+    folder = _ITEM_FOLDER.get(item_id)
+    if folder is None:
+        folder = f"{SECTION_FOLDERS[item_id[0]]}/{item_id.replace('.', '')}"
+    return folder
+
+
+def _zip_info(path: str, date_time: tuple[int, ...]) -> zipfile.ZipInfo:
+    # ZipInfo explícito para no hacer un stat/time.localtime() por entrada.
+    return zipfile.ZipInfo(path, date_time=date_time)
+
+
+def _build_zip(local: str, fecha: str, session_photos: dict[str, list[dict]], summary: str) -> bytes:
+    # Las fotos ya son JPEG: se guardan sin comprimir (DEFLATE no les gana
+    # nada y cuesta CPU). Solo el resumen de texto va comprimido.
+    # Las fotos de MongoDB llevan su fecha de carga; las de sesión (que no la
+    # guardan) y el resumen, la hora de armado del ZIP.
+    built_at = datetime.now().timetuple()[:6]
     buf = io.BytesIO()
-    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
         if use_mongo:
-            all_photos = db.get_all_photos(local, fecha)
-            for p in all_photos:
-                sec = p["section"]
-                code = p["item_id"].replace(".", "")
-                path = f"{SECTION_FOLDERS[sec]}/{code}/{p['photo_name']}"
-                zf.writestr(path, p["photo_data"])
+            for p in db.get_all_photos(local, fecha):
+                path = f"{_item_folder(p['item_id'])}/{p['photo_name']}"
+                created_at = p.get("created_at")
+                date_time = db.as_utc(created_at).astimezone().timetuple()[:6] if created_at else built_at
+                zf.writestr(_zip_info(path, date_time), p["photo_data"])
         else:
-            for item_id, photos in st.session_state.cap_photos.items():
-                sec = item_id[0]
-                code = item_id.replace(".", "")
+            for item_id, photos in session_photos.items():
+                folder = _item_folder(item_id)
                 for p in photos:
-                    path = f"{SECTION_FOLDERS[sec]}/{code}/{p['name']}"
-                    zf.writestr(path, p["data"])
+                    zf.writestr(_zip_info(f"{folder}/{p['name']}", built_at), p["data"])
 
-        summary = _build_summary(local, fecha)
-        zf.writestr("resumen.txt", summary)
+        zf.writestr(
+            _zip_info("resumen.txt", built_at), summary, compress_type=zipfile.ZIP_DEFLATED, compresslevel=1
+        )
 
     return buf.getvalue()
 
 
-def _build_summary(local: str, fecha: str) -> str:
+def _zip_fingerprint(counts: dict[str, int], size_bytes: int) -> tuple:
+    """Identifica el conjunto de fotos para invalidar el ZIP cacheado.
+
+    En sesión alcanza con el contador local; en MongoDB otras sesiones pueden
+    agregar o borrar fotos, así que se usan los conteos por ítem y el tamaño total.
+    """
+    if use_mongo:
+        return tuple(sorted(counts.items())), size_bytes
+    return (st.session_state.cap_photos_version,)
+
+
+def _get_zip(
+    zip_cache: dict, key: tuple, local: str, fecha: str, session_photos: dict[str, list[dict]], summary: str
+) -> bytes:
+    """Devuelve el ZIP de fotos, reconstruyéndolo solo si cambió `key`.
+
+    Se ejecuta recién al tocar "Descargar" (data diferida de st.download_button),
+    fuera del script: todo lo que necesita llega por parámetro, no de st.session_state.
+    """
+    if zip_cache.get("key") == key:
+        return zip_cache["data"]
+    data = _build_zip(local, fecha, session_photos, summary)
+    zip_cache.update(key=key, data=data)
+    return data
+
+
+def _build_summary(local: str, fecha: str, counts: dict[str, int], size_str: str) -> str:
     lines = [
         "AUDITORÍA — FOTOS CAPTURADAS",
         f"Local: {local or 'Sin especificar'}",
         f"Fecha: {fecha}",
         f"Generado: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-        f"Fotos totales: {_total_photos(local, fecha)}",
-        f"Tamaño: {_total_size_str(local, fecha)}",
+        f"Fotos totales: {sum(counts.values())}",
+        f"Tamaño: {size_str}",
         f"Almacenamiento: {'MongoDB Atlas' if use_mongo else 'Sesión local'}",
         "",
         "DETALLE POR ÍTEM:",
     ]
     for c in CRITERIA:
-        n = _photo_count(local, fecha, c["id"])
+        n = counts.get(c["id"], 0)
         if c["id"] in NO_PHOTO_ITEMS:
             flag = "⏭️"
         elif n > 0:
@@ -427,6 +529,7 @@ with st.expander(_cfg_summary, expanded=False):
 
 fecha_str = audit_date.strftime("%Y-%m")
 _eval_map = _get_eval_map(local_name, fecha_str)
+photo_counts = _photo_counts(local_name, fecha_str)
 
 if st.session_state.get("_cap_pending_reset"):
     _confirm_reset(local_name, fecha_str)
@@ -466,15 +569,28 @@ with st.sidebar:
         "6. Al terminar, revisá el reporte en 🔍 Auditoría"
     )
     st.divider()
-    tp = _total_photos(local_name, fecha_str)
+    tp = sum(photo_counts.values())
+    size_bytes = _total_size_bytes(local_name, fecha_str) if tp > 0 else 0
+    size_str = _size_str(size_bytes)
     if tp > 0:
         st.metric("Fotos totales", tp)
-        st.caption(f"💾 Tamaño: {_total_size_str(local_name, fecha_str)}")
+        st.caption(f"💾 Tamaño: {size_str}")
 
 # ── Progreso ──────────────────────────────────────────────────────────────
 
+# Una sola pasada por CRITERIA: evaluados y pendientes por sección.
 total_items = len(CRITERIA)
-items_covered = sum(1 for c in CRITERIA if c["id"] in _eval_map)
+total_by_sec = {sec_key: 0 for sec_key in SECTIONS}
+covered_by_sec = dict(total_by_sec)
+missing_by_sec: dict[str, list[dict]] = {sec_key: [] for sec_key in SECTIONS}
+for c in CRITERIA:
+    total_by_sec[c["section"]] += 1
+    if c["id"] in _eval_map:
+        covered_by_sec[c["section"]] += 1
+    else:
+        missing_by_sec[c["section"]].append(c)
+items_covered = sum(covered_by_sec.values())
+n_missing = total_items - items_covered
 
 with st.container(border=True):
     st.markdown("### 📊 Progreso")
@@ -485,10 +601,8 @@ with st.container(border=True):
 
     metric_cols = st.columns(5)
     for i, (sec_key, short_name) in enumerate(SECTION_SHORT.items()):
-        sec_items = get_criteria_by_section(sec_key)
-        done = sum(1 for c in sec_items if c["id"] in _eval_map)
         with metric_cols[i]:
-            st.metric(short_name, f"{done}/{len(sec_items)}")
+            st.metric(short_name, f"{covered_by_sec[sec_key]}/{total_by_sec[sec_key]}")
 
 # ── Captura ───────────────────────────────────────────────────────────────
 
@@ -641,11 +755,11 @@ if selected:
         # ── Fotos ya cargadas para este ítem (evidencia previa) ────────────
         if item_id not in NO_PHOTO_ITEMS:
             if use_mongo:
-                item_photos = db.get_photos_for_item(local_name, fecha_str, item_id)
+                item_photos = _get_item_thumbs(local_name, fecha_str, item_id, photo_counts.get(item_id, 0))
             else:
                 item_photos_raw = st.session_state.cap_photos.get(item_id, [])
                 item_photos = [
-                    {"_id": str(i), "photo_data": p["data"], "photo_name": p["name"]}
+                    {"_id": str(i), "thumb_data": p.get("thumb", p["data"]), "photo_name": p["name"]}
                     for i, p in enumerate(item_photos_raw)
                 ]
 
@@ -655,7 +769,7 @@ if selected:
                 _preview_cols = st.columns(_preview_n + (1 if _n_photos > 5 else 0))
                 for i in range(_preview_n):
                     with _preview_cols[i]:
-                        st.image(item_photos[i]["photo_data"], width=48)
+                        st.image(item_photos[i]["thumb_data"], width=48)
                 if _n_photos > 5:
                     with _preview_cols[5]:
                         st.caption(f"+{_n_photos - 5}")
@@ -670,7 +784,7 @@ if selected:
                             photo = item_photos[idx]
                             with cols[j]:
                                 st.image(
-                                    photo["photo_data"],
+                                    photo["thumb_data"],
                                     caption=photo["photo_name"],
                                     use_container_width=True,
                                 )
@@ -688,10 +802,12 @@ if selected:
                                             if use_mongo:
                                                 db.delete_photo(str(photo["_id"]))
                                                 _get_counts.clear()
+                                                _thumb_cache().pop((local_name, fecha_str, item_id), None)
                                             else:
                                                 st.session_state.cap_photos[item_id].pop(idx)
                                                 if not st.session_state.cap_photos[item_id]:
                                                     del st.session_state.cap_photos[item_id]
+                                                st.session_state.cap_photos_version += 1
                                             st.session_state.pop(_del_confirm_key, None)
                                             st.toast("🗑️ Foto borrada")
                                             st.rerun()
@@ -779,38 +895,40 @@ if selected:
             ok = _persist_evaluation(local_name, fecha_str, section, selected, eval_status, eval_nota, tipo_auditoria)
             saved_photo = False
             try:
+                new_photos: list[tuple[bytes, bytes]] = []
                 if camera_photo is not None:
-                    compressed = compress_photo(camera_photo)
+                    new_photos.append(_compress_with_thumb(camera_photo))
+                if uploaded:
+                    # Pillow libera el GIL al decodificar/codificar: las fotos
+                    # de la galería se comprimen en paralelo.
+                    with ThreadPoolExecutor(max_workers=min(MAX_COMPRESS_WORKERS, len(uploaded))) as pool:
+                        new_photos.extend(pool.map(_compress_with_thumb, uploaded))
+                if new_photos:
                     if use_mongo:
-                        name = db.next_photo_name(local_name, fecha_str, item_id)
-                        db.save_photo(local_name, fecha_str, section, item_id, compressed, name)
+                        # Un solo conteo en Atlas para nombrar todo el lote.
+                        names = db.next_photo_names(local_name, fecha_str, item_id, len(new_photos))
+                        db.save_photos(
+                            local_name,
+                            fecha_str,
+                            section,
+                            item_id,
+                            [(compressed, name, thumb) for (compressed, thumb), name in zip(new_photos, names)],
+                        )
                         _get_counts.clear()
                     else:
-                        code = item_id.replace(".", "")
-                        st.session_state.cap_photos.setdefault(item_id, [])
-                        n = len(st.session_state.cap_photos[item_id]) + 1
-                        st.session_state.cap_photos[item_id].append(
-                            {"data": compressed, "name": f"{code}_{n:03d}.jpg"}
-                        )
-                    saved_photo = True
-                if uploaded:
-                    for f in uploaded:
-                        compressed = compress_photo(f)
-                        if use_mongo:
-                            name = db.next_photo_name(local_name, fecha_str, item_id)
-                            db.save_photo(local_name, fecha_str, section, item_id, compressed, name)
-                        else:
-                            code = item_id.replace(".", "")
-                            st.session_state.cap_photos.setdefault(item_id, [])
-                            n = len(st.session_state.cap_photos[item_id]) + 1
-                            st.session_state.cap_photos[item_id].append(
-                                {"data": compressed, "name": f"{code}_{n:03d}.jpg"}
+                        code = _ITEM_CODE[item_id]
+                        item_list = st.session_state.cap_photos.setdefault(item_id, [])
+                        for compressed, thumb in new_photos:
+                            item_list.append(
+                                {"data": compressed, "thumb": thumb, "name": f"{code}_{len(item_list) + 1:03d}.jpg"}
                             )
-                    if use_mongo:
-                        _get_counts.clear()
                     saved_photo = True
             except Exception as e:
                 st.error(f"No se pudo guardar la foto: {e}")
+            if use_mongo:
+                _thumb_cache().pop((local_name, fecha_str, item_id), None)
+            else:
+                st.session_state.cap_photos_version += 1
 
             if ok:
                 st.toast(
@@ -856,9 +974,6 @@ if selected:
 
 # ── Finalizar ─────────────────────────────────────────────────────────────
 
-tp = _total_photos(local_name, fecha_str)
-missing = [c for c in CRITERIA if c["id"] not in _eval_map]
-
 with st.container(border=True):
     st.markdown("### ✅ Finalizar")
 
@@ -890,12 +1005,12 @@ with st.container(border=True):
     elif items_covered > 0:
         st.markdown(
             f"**{items_covered} de {total_items}** ítems evaluados "
-            f"({tp} fotos, {_total_size_str(local_name, fecha_str)})"
+            f"({tp} fotos, {size_str})"
         )
-        if missing:
-            with st.expander(f"ℹ️ {len(missing)} ítems sin evaluar"):
+        if n_missing:
+            with st.expander(f"ℹ️ {n_missing} ítems sin evaluar"):
                 for sec_key in SECTIONS:
-                    sec_missing = [m for m in missing if m["section"] == sec_key]
+                    sec_missing = missing_by_sec[sec_key]
                     if sec_missing:
                         st.markdown(
                             f"**{sec_key}. {SECTION_SHORT[sec_key]}** ({len(sec_missing)})"
@@ -910,10 +1025,18 @@ with st.container(border=True):
             )
         else:
             local_slug = (local_name.strip().replace(" ", "-") or "Local")
-            zip_data = _build_zip(local_name, fecha_str)
+            _zip_key = (local_name, fecha_str, _zip_fingerprint(photo_counts, size_bytes))
             st.download_button(
                 "📥 Descargar ZIP (fotos)",
-                data=zip_data,
+                data=functools.partial(
+                    _get_zip,
+                    st.session_state.setdefault("_cap_zip", {}),
+                    _zip_key,
+                    local_name,
+                    fecha_str,
+                    st.session_state.cap_photos,
+                    _build_summary(local_name, fecha_str, photo_counts, size_str),
+                ),
                 file_name=f"auditoria_{fecha_str}_{local_slug}.zip",
                 mime="application/zip",
                 use_container_width=True,
@@ -4,10 +4,12 @@ Grido Audit Vision — Historial y seguimiento de auditorías.
 
 from __future__ import annotations
 
+from collections import Counter, defaultdict
+
 import pandas as pd
 import streamlit as st
 
-from criteria import CRITERIA, SECTIONS, get_section_name
+from criteria import ITEM_LABELS, SECTIONS
 import db
 
 if not db.is_connected():
@@ -24,6 +26,24 @@ tab_overview, tab_detail, tab_trends, tab_admin = st.tabs(
 
 history = db.get_audit_history()
 
+# Auditorías por local (orden de aparición estable), cada lista ordenada por período.
+_by_local: dict[str, list[dict]] = {}
+for h in history:
+    _by_local.setdefault(h["local"], []).append(h)
+for _hs in _by_local.values():
+    _hs.sort(key=lambda h: h["fecha"])
+
+# (campo en get_audit_history, columna mostrada) para la tabla de resumen.
+_OVERVIEW_COLS = [
+    ("local", "Local"),
+    ("fecha", "Período"),
+    ("total", "Ítems"),
+    ("conformes", "Conformes"),
+    ("observaciones", "Observaciones"),
+    ("no_conformes", "No Conformes"),
+    ("pct_conforme", "% Conforme"),
+]
+
 # ── Tab: Resumen ──────────────────────────────────────────────────────────
 with tab_overview:
     st.header("Resumen de auditorías")
@@ -31,17 +51,7 @@ with tab_overview:
     if not history:
         st.info("Todavía no hay auditorías registradas.")
     else:
-        df_hist = pd.DataFrame(history)
-        df_hist = df_hist.rename(columns={
-            "local": "Local",
-            "fecha": "Período",
-            "total": "Ítems",
-            "conformes": "Conformes",
-            "observaciones": "Observaciones",
-            "no_conformes": "No Conformes",
-            "pct_conforme": "% Conforme",
-        })
-        df_hist = df_hist.drop(columns=["last_analyzed"], errors="ignore")
+        df_hist = pd.DataFrame({disp: [h.get(src) for h in history] for src, disp in _OVERVIEW_COLS})
 
         st.dataframe(
             df_hist,
@@ -56,14 +66,9 @@ with tab_overview:
 
         st.divider()
 
-        locales = df_hist["Local"].unique().tolist()
-        if len(locales) > 1:
+        if len(_by_local) > 1:
             st.subheader("Comparativa por local")
-            compare_df = (
-                df_hist.groupby("Local")
-                .agg({"Ítems": "sum", "Conformes": "sum", "No Conformes": "sum"})
-                .reset_index()
-            )
+            compare_df = df_hist.groupby("Local", as_index=False)[["Ítems", "Conformes", "No Conformes"]].sum()
             compare_df["% Conforme"] = (
                 compare_df["Conformes"] / compare_df["Ítems"] * 100
             ).round(0)
@@ -86,24 +91,17 @@ with tab_detail:
         if not results:
             st.info("No se encontraron resultados para esta auditoría.")
         else:
-            rows = []
+            # Una sola pasada: conteo por estado y agrupación por sección.
+            status_counts: Counter[str] = Counter()
+            by_sec: dict[str, list[dict]] = defaultdict(list)
             for r in results:
-                rows.append({
-                    "Sección": get_section_name(r.get("section", "")),
-                    "Ítem": r["item_id"],
-                    "Nombre": r.get("item_name", ""),
-                    "Estado": r["status"],
-                    "Justificación": r.get("justificacion", ""),
-                    "Detalles": "; ".join(r.get("detalles_observados", [])),
-                    "Recomendaciones": "; ".join(r.get("recomendaciones", [])),
-                })
-            df_detail = pd.DataFrame(rows)
-
-            status_counts = df_detail["Estado"].value_counts()
+                status_counts[r["status"]] += 1
+                by_sec[r.get("section", "")].append(r)
+
             cols = st.columns(3)
             for i, status_val in enumerate(["Conforme", "Observación", "No Conforme"]):
-                count = status_counts.get(status_val, 0)
-                pct = round(count / len(df_detail) * 100) if len(df_detail) else 0
+                count = status_counts[status_val]
+                pct = round(count / len(results) * 100) if results else 0
                 cols[i].metric(
                     f"{'✅' if status_val == 'Conforme' else '⚠️' if status_val == 'Observación' else '❌'} {status_val}",
                     f"{count} ({pct}%)",
@@ -112,24 +110,26 @@ with tab_detail:
             st.divider()
 
             for sec_key, sec_name in SECTIONS.items():
-                sec_df = df_detail[df_detail["Sección"] == sec_name]
-                if sec_df.empty:
+                sec_rows = by_sec.get(sec_key)
+                if not sec_rows:
                     continue
-                with st.expander(f"**{sec_key}. {sec_name}** — {len(sec_df)} ítems"):
-                    for _, row in sec_df.iterrows():
-                        status = row["Estado"]
+                with st.expander(f"**{sec_key}. {sec_name}** — {len(sec_rows)} ítems"):
+                    # Todas las tarjetas de la sección en un único elemento.
+                    cards = []
+                    for row in sec_rows:
+                        status = row["status"]
                         color = {"Conforme": "#2ecc71", "Observación": "#f39c12", "No Conforme": "#e74c3c"}.get(status, "#95a5a6")
                         icon = {"Conforme": "✅", "Observación": "⚠️", "No Conforme": "❌"}.get(status, "❔")
-                        st.markdown(
+                        cards.append(
                             f"<div style='border-left:4px solid {color};padding:8px 12px;"
                             f"margin-bottom:8px;background:#fafafa;border-radius:4px;'>"
-                            f"<strong>{row['Ítem']} — {row['Nombre']}</strong> "
+                            f"<strong>{row['item_id']} — {row.get('item_name', '')}</strong> "
                             f"<span style='background:{color};color:white;padding:2px 8px;"
                             f"border-radius:8px;font-size:0.85rem;'>{icon} {status}</span><br/>"
-                            f"<small>{row['Justificación']}</small>"
-                            f"</div>",
-                            unsafe_allow_html=True,
+                            f"<small>{row.get('justificacion', '')}</small>"
+                            f"</div>"
                         )
+                    st.markdown("".join(cards), unsafe_allow_html=True)
 
 
 # ── Tab: Tendencias ───────────────────────────────────────────────────────
@@ -139,23 +139,22 @@ with tab_trends:
     if not history:
         st.info("No hay auditorías registradas.")
     else:
-        locales = list({h["local"] for h in history})
-        local_sel = st.selectbox("Local", locales, key="trend_local")
+        local_sel = st.selectbox("Local", list(_by_local), key="trend_local")
 
         st.subheader("Evolución de conformidad")
-        local_history = [h for h in history if h["local"] == local_sel]
-        local_history.sort(key=lambda h: h["fecha"])
+        local_history = _by_local[local_sel]
 
         if len(local_history) >= 2:
-            df_trend = pd.DataFrame(local_history)[["fecha", "pct_conforme", "conformes", "no_conformes", "total"]]
-            df_trend = df_trend.rename(columns={
-                "fecha": "Período",
-                "pct_conforme": "% Conforme",
-                "conformes": "Conformes",
-                "no_conformes": "No Conformes",
-                "total": "Total",
+            fechas = [h["fecha"] for h in local_history]
+            pcts = [h["pct_conforme"] for h in local_history]
+            st.line_chart(pd.Series(pcts, index=pd.Index(fechas, name="Período"), name="% Conforme"))
+            df_trend = pd.DataFrame({
+                "Período": fechas,
+                "% Conforme": pcts,
+                "Conformes": [h["conformes"] for h in local_history],
+                "No Conformes": [h["no_conformes"] for h in local_history],
+                "Total": [h["total"] for h in local_history],
             })
-            st.line_chart(df_trend.set_index("Período")["% Conforme"])
             st.dataframe(df_trend, use_container_width=True, hide_index=True)
         elif len(local_history) == 1:
             h = local_history[0]
@@ -178,13 +177,12 @@ with tab_trends:
 
         st.divider()
         st.subheader("Evolución por ítem")
-        all_items = [(c["id"], c["name"]) for c in CRITERIA]
-        item_sel = st.selectbox(
+        item_id = st.selectbox(
             "Seleccionar ítem",
-            [f"{cid} — {cname[:60]}" for cid, cname in all_items],
+            ITEM_LABELS,
+            format_func=ITEM_LABELS.__getitem__,
             key="trend_item",
         )
-        item_id = item_sel.split(" — ")[0]
         evolution = db.get_item_evolution(local_sel, item_id)
         if evolution:
             df_evo = pd.DataFrame(evolution)
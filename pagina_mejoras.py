@@ -5,6 +5,7 @@ Vista operativa (gestión de desvíos) y vista ejecutiva (dashboard + decisiones
 
 from __future__ import annotations
 
+import csv
 import io
 from datetime import date, datetime, timedelta, timezone
 
@@ -12,9 +13,9 @@ import pandas as pd
 import streamlit as st
 
 from criteria import (
+    ESTADO_DESVIO_IDX,
     ESTADOS_DESVIO,
     LOCALES,
-    PRIORIDADES,
     ROLES_RESPONSABLE,
     SECTIONS,
     TIPOS_DESVIO,
@@ -31,11 +32,137 @@ if not db.is_connected():
 rol = st.session_state.get("rol", "operativo")
 
 
+# ══════════════════════════════════════════════════════════════════════════
+# Lecturas cacheadas (cada interacción re-ejecuta la página entera)
+# ══════════════════════════════════════════════════════════════════════════
+
+
+_ESTADOS_ACTIVOS = ("pendiente", "en_proceso")
+
+# Desvíos por página en la bandeja: solo la página visible instancia widgets.
+_BANDEJA_PAGE_SIZE = 20
+
+# (sección, columna) de la tabla de scores del dashboard.
+_SEC_COLS = [(k, f"{k}. {name[:20]}") for k, name in SECTIONS.items()]
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_desvios(local: str | None) -> list[dict]:
+    """db.get_desvios, cached so widget reruns don't hit MongoDB."""
+    return db.get_desvios(local=local)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_desvios_auditoria(local: str, auditoria_fecha: str) -> list[dict]:
+    return db.get_desvios(local=local, auditoria_fecha=auditoria_fecha)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_plan_semanal(local: str | None, limit: int) -> list[dict]:
+    return db.get_plan_semanal(local=local, limit=limit)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_desvios_por_vencer(local: str | None, days: int) -> list[dict]:
+    return db.get_desvios_por_vencer(local=local, days=days)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_top_reincidentes(local: str | None, limit: int) -> list[dict]:
+    return db.get_top_reincidentes(local=local, limit=limit)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_monthly_scores(local: str, months: int) -> list[dict]:
+    return db.get_monthly_scores(local, months=months)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_responsables(local: str) -> list[dict]:
+    return db.get_responsables(local=local)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _get_decisiones_pendientes(local: str | None) -> list[dict]:
+    return db.get_decisiones_pendientes(local=local)
+
+
+def _clear_desvio_caches() -> None:
+    """Invalidate cached desvío/decisión reads after a write from this page."""
+    _get_desvios.clear()
+    _get_desvios_auditoria.clear()
+    _get_plan_semanal.clear()
+    _get_desvios_por_vencer.clear()
+    _get_top_reincidentes.clear()
+    _get_decisiones_pendientes.clear()
+
+
 # ══════════════════════════════════════════════════════════════════════════
 # VISTA OPERATIVA
 # ══════════════════════════════════════════════════════════════════════════
 
 
+@st.fragment
+def _desvio_editor(d: dict) -> None:
+    """Estado/responsable/fecha límite y acciones de un desvío de la bandeja.
+
+    Como fragmento, tocar sus widgets solo re-ejecuta esta tarjeta; guardar o
+    cerrar sí re-ejecuta la página entera porque cambian los KPIs y la lista.
+    """
+    did = d["_id"]
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        new_estado = st.selectbox(
+            "Estado",
+            ESTADOS_DESVIO,
+            index=ESTADO_DESVIO_IDX.get(d["estado"], 0),
+            key=f"est_{did}",
+        )
+    with c2:
+        responsables = _get_responsables(d["local"])
+        resp_names = ["(sin asignar)"] + [r["nombre"] for r in responsables]
+        cur_resp = d.get("responsable", "")
+        resp_idx = resp_names.index(cur_resp) if cur_resp in resp_names else 0
+        new_resp = st.selectbox("Responsable", resp_names, index=resp_idx, key=f"resp_{did}")
+    with c3:
+        cur_limit = d.get("fecha_limite")
+        if isinstance(cur_limit, datetime):
+            cur_limit = cur_limit.date()
+        new_limit = st.date_input(
+            "Fecha límite",
+            value=cur_limit or date.today() + timedelta(days=7),
+            key=f"lim_{did}",
+        )
+
+    col_save, col_close = st.columns(2)
+    with col_save:
+        if st.button("Guardar cambios", key=f"save_{did}"):
+            updates = {
+                "estado": new_estado,
+                "responsable": "" if new_resp == "(sin asignar)" else new_resp,
+                "fecha_limite": datetime.combine(new_limit, datetime.min.time()).replace(tzinfo=timezone.utc),
+            }
+            db.update_desvio(did, updates)
+            if new_estado == "cumplido":
+                db.close_desvio(did, "Cerrado desde bandeja")
+            _clear_desvio_caches()
+            st.success(f"Desvío {d['item_codigo']} actualizado.")
+            st.rerun(scope="app")
+    with col_close:
+        if d["estado"] != "cumplido":
+            comentario = st.text_input("Comentario cierre", key=f"com_{did}", placeholder="Describir resolución")
+            if st.button("Cerrar desvío", key=f"close_{did}"):
+                db.close_desvio(did, comentario or "Sin comentario")
+                if d.get("tipo_desvio") == "estructural":
+                    try:
+                        db.create_decision(did, d["item_codigo"], d["local"], d.get("ai_justificacion", ""))
+                    except Exception:
+                        pass
+                _clear_desvio_caches()
+                st.success(f"Desvío {d['item_codigo']} cerrado.")
+                st.rerun(scope="app")
+
+
 def _render_vista_operativa():
     tab_bandeja, tab_plan, tab_control = st.tabs(
         ["Desvíos Activos", "Plan Semanal", "Control Semanal"]
@@ -48,7 +175,8 @@ def _render_vista_operativa():
     with tab_bandeja:
         st.header("Desvíos Activos")
 
-        kpis = db.get_desvio_kpis(local=_local)
+        desvios = _get_desvios(_local)
+        kpis = db.desvio_kpis(desvios)
         k1, k2, k3, k4 = st.columns(4)
         k1.metric("Abiertos", kpis["abiertos"])
         k2.metric("% Cerrados en plazo (30d)", f"{kpis['pct_cerrados_en_plazo']}%")
@@ -57,14 +185,21 @@ def _render_vista_operativa():
 
         st.divider()
 
-        desvios = db.get_desvios(local=_local)
-        activos = [d for d in desvios if d["estado"] in ("pendiente", "en_proceso")]
+        activos = [d for d in desvios if d["estado"] in _ESTADOS_ACTIVOS]
 
         if not activos:
             st.success("No hay desvíos activos.")
         else:
-            for d in activos:
-                did = d["_id"]
+            n_pages = (len(activos) + _BANDEJA_PAGE_SIZE - 1) // _BANDEJA_PAGE_SIZE
+            page = 1
+            if n_pages > 1:
+                # Si al cerrar desvíos se achicó la lista, volver a la última página válida.
+                if st.session_state.get("desv_page", 1) > n_pages:
+                    st.session_state["desv_page"] = n_pages
+                page = st.number_input("Página", min_value=1, max_value=n_pages, value=1, key="desv_page")
+                st.caption(f"{len(activos)} desvíos activos · página {page} de {n_pages}")
+            start = (page - 1) * _BANDEJA_PAGE_SIZE
+            for d in activos[start:start + _BANDEJA_PAGE_SIZE]:
                 color = "#e74c3c" if d["nivel"] == "rojo" else "#f39c12"
                 reinc = " | REINCIDENTE" if d.get("reincidente") else ""
                 st.markdown(
@@ -78,55 +213,7 @@ def _render_vista_operativa():
                     unsafe_allow_html=True,
                 )
 
-                c1, c2, c3 = st.columns(3)
-                with c1:
-                    new_estado = st.selectbox(
-                        "Estado",
-                        ESTADOS_DESVIO,
-                        index=ESTADOS_DESVIO.index(d["estado"]) if d["estado"] in ESTADOS_DESVIO else 0,
-                        key=f"est_{did}",
-                    )
-                with c2:
-                    responsables = db.get_responsables(local=d["local"])
-                    resp_names = ["(sin asignar)"] + [r["nombre"] for r in responsables]
-                    cur_resp = d.get("responsable", "")
-                    resp_idx = resp_names.index(cur_resp) if cur_resp in resp_names else 0
-                    new_resp = st.selectbox("Responsable", resp_names, index=resp_idx, key=f"resp_{did}")
-                with c3:
-                    cur_limit = d.get("fecha_limite")
-                    if isinstance(cur_limit, datetime):
-                        cur_limit = cur_limit.date()
-                    new_limit = st.date_input(
-                        "Fecha límite",
-                        value=cur_limit or date.today() + timedelta(days=7),
-                        key=f"lim_{did}",
-                    )
-
-                col_save, col_close = st.columns(2)
-                with col_save:
-                    if st.button("Guardar cambios", key=f"save_{did}"):
-                        updates = {
-                            "estado": new_estado,
-                            "responsable": "" if new_resp == "(sin asignar)" else new_resp,
-                            "fecha_limite": datetime.combine(new_limit, datetime.min.time()).replace(tzinfo=timezone.utc),
-                        }
-                        db.update_desvio(did, updates)
-                        if new_estado == "cumplido":
-                            db.close_desvio(did, "Cerrado desde bandeja")
-                        st.success(f"Desvío {d['item_codigo']} actualizado.")
-                        st.rerun()
-                with col_close:
-                    if d["estado"] != "cumplido":
-                        comentario = st.text_input("Comentario cierre", key=f"com_{did}", placeholder="Describir resolución")
-                        if st.button("Cerrar desvío", key=f"close_{did}"):
-                            db.close_desvio(did, comentario or "Sin comentario")
-                            if d.get("tipo_desvio") == "estructural":
-                                try:
-                                    db.create_decision(did, d["item_codigo"], d["local"], d.get("ai_justificacion", ""))
-                                except Exception:
-                                    pass
-                            st.success(f"Desvío {d['item_codigo']} cerrado.")
-                            st.rerun()
+                _desvio_editor(d)
 
                 st.divider()
 
@@ -135,14 +222,8 @@ def _render_vista_operativa():
         st.header("Plan de Mejora Semanal")
 
         plan_local = st.selectbox("Local", LOCALES, key="plan_local")
-        desvios_plan = db.get_desvios(local=plan_local)
-        activos_plan = [d for d in desvios_plan if d["estado"] in ("pendiente", "en_proceso")]
-
-        activos_plan.sort(key=lambda d: (
-            0 if d.get("reincidente") else 1,
-            PRIORIDADES.index(d.get("prioridad", "baja")) if d.get("prioridad", "baja") in PRIORIDADES else 2,
-        ))
-        top10 = activos_plan[:10]
+        # Orden (reincidentes, prioridad) y límite resueltos en MongoDB.
+        top10 = _get_plan_semanal(plan_local, 10)
 
         if not top10:
             st.success("No hay desvíos activos para planificar.")
@@ -170,14 +251,12 @@ def _render_vista_operativa():
                         "Responsable": d.get("responsable", "Sin asignar"),
                         "Fecha límite": _fmt_date(d.get("fecha_limite")),
                     })
-                df_plan = pd.DataFrame(rows)
                 st.subheader(f"Plan semanal — {plan_local}")
-                st.dataframe(df_plan, use_container_width=True, hide_index=True)
+                st.dataframe(rows, use_container_width=True, hide_index=True)
 
-                csv = df_plan.to_csv(index=False).encode("utf-8")
                 st.download_button(
                     "Descargar CSV",
-                    data=csv,
+                    data=_rows_to_csv(rows),
                     file_name=f"plan_semanal_{plan_local}_{date.today()}.csv",
                     mime="text/csv",
                     use_container_width=True,
@@ -187,9 +266,24 @@ def _render_vista_operativa():
     with tab_control:
         st.header("Control Semanal")
 
-        por_vencer = db.get_desvios_por_vencer(local=_local, days=7)
-        vencidos = [d for d in por_vencer if d.get("fecha_limite") and d["fecha_limite"] < datetime.now(timezone.utc)]
-        proximos = [d for d in por_vencer if d.get("fecha_limite") and d["fecha_limite"] >= datetime.now(timezone.utc)]
+        por_vencer = _get_desvios_por_vencer(_local, 7)
+
+        # Una sola pasada con un único "ahora": vencidos / próximos y sus líneas.
+        now = datetime.now(timezone.utc)
+        vencidos = []
+        proximos = []
+        lines = []
+        for d in por_vencer:
+            fl = d.get("fecha_limite")
+            vencido = fl is not None and db.as_utc(fl) < now
+            if vencido:
+                vencidos.append(d)
+            elif fl is not None:
+                proximos.append(d)
+            lines.append(
+                f"{'🔴' if vencido else '🟡'} **{d['item_codigo']}** — {d.get('item_descripcion', '')[:60]} "
+                f"({d['local']}) · Límite: {_fmt_date(fl)}"
+            )
 
         st.metric("Vencidos", len(vencidos))
         st.metric("Vencen en 7 días", len(proximos))
@@ -197,24 +291,14 @@ def _render_vista_operativa():
         if not por_vencer:
             st.success("No hay desvíos vencidos ni por vencer.")
         else:
-            for d in por_vencer:
-                vencido = d.get("fecha_limite") and d["fecha_limite"] < datetime.now(timezone.utc)
-                icon = "🔴" if vencido else "🟡"
-                st.markdown(
-                    f"{icon} **{d['item_codigo']}** — {d.get('item_descripcion', '')[:60]} "
-                    f"({d['local']}) · Límite: {_fmt_date(d.get('fecha_limite'))}"
-                )
+            st.markdown("\n\n".join(lines))
 
             if st.button("Revisión de miércoles", type="primary", use_container_width=True):
-                cumplidos = 0
-                pendientes = 0
-                for d in por_vencer:
-                    if d.get("fecha_limite") and d["fecha_limite"] < datetime.now(timezone.utc):
-                        db.update_desvio(d["_id"], {"estado": "incumplido"})
-                        pendientes += 1
-                    else:
-                        pendientes += 1
+                for d in vencidos:
+                    db.update_desvio(d["_id"], {"estado": "incumplido"})
+                pendientes = len(por_vencer)
 
+                _clear_desvio_caches()
                 st.info(f"Revisión completada. {pendientes} desvío(s) revisados.")
                 st.rerun()
 
@@ -236,7 +320,8 @@ def _render_vista_ejecutiva():
     with tab_dash:
         st.header("Dashboard Ejecutivo")
 
-        kpis = db.get_desvio_kpis(local=_local)
+        desvios = _get_desvios(_local)
+        kpis = db.desvio_kpis(desvios)
         k1, k2, k3, k4 = st.columns(4)
         k1.metric("Desvíos abiertos", kpis["abiertos"])
         k2.metric("% En plazo (30d)", f"{kpis['pct_cerrados_en_plazo']}%")
@@ -246,7 +331,7 @@ def _render_vista_ejecutiva():
         st.divider()
 
         for loc in (LOCALES if not _local else [_local]):
-            scores_data = db.get_monthly_scores(loc, months=6)
+            scores_data = _get_monthly_scores(loc, 6)
             if scores_data:
                 st.subheader(f"Evolución — {loc}")
 
@@ -256,18 +341,17 @@ def _render_vista_ejecutiva():
                 df_trend = pd.DataFrame({"Período": fechas, "Score Global": globals_})
                 st.line_chart(df_trend.set_index("Período"))
 
-                rows = []
-                for s in scores_data:
-                    row = {"Período": s["fecha"]}
-                    for sec_key, sec_name in SECTIONS.items():
-                        row[f"{sec_key}. {sec_name[:20]}"] = s.get("scores", {}).get(sec_key, 0)
-                    row["Global"] = s.get("score_global", 0)
-                    rows.append(row)
-                st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+                # Tabla columna a columna (dict de listas), reutilizando fechas/globales.
+                sec_scores = [s.get("scores", {}) for s in scores_data]
+                table = {"Período": fechas}
+                for sec_key, col in _SEC_COLS:
+                    table[col] = [sc.get(sec_key, 0) for sc in sec_scores]
+                table["Global"] = globals_
+                st.dataframe(pd.DataFrame(table), use_container_width=True, hide_index=True)
 
         st.divider()
         st.subheader("Top 5 ítems reincidentes")
-        reincidentes = db.get_top_reincidentes(local=_local, limit=5)
+        reincidentes = _get_top_reincidentes(_local, 5)
         if reincidentes:
             for r in reincidentes:
                 st.markdown(
@@ -280,8 +364,8 @@ def _render_vista_ejecutiva():
         st.divider()
         st.subheader("Desvíos estructurales pendientes")
         estructurales = [
-            d for d in db.get_desvios(local=_local)
-            if d.get("tipo_desvio") == "estructural" and d["estado"] in ("pendiente", "en_proceso")
+            d for d in desvios
+            if d.get("tipo_desvio") == "estructural" and d["estado"] in _ESTADOS_ACTIVOS
         ]
         if estructurales:
             for d in estructurales:
@@ -297,19 +381,20 @@ def _render_vista_ejecutiva():
         st.header("Panel de Decisiones")
         st.caption("Desvíos estructurales que requieren decisión de la dirección.")
 
-        decisiones = db.get_decisiones_pendientes(local=_local)
+        decisiones = _get_decisiones_pendientes(_local)
 
         if not decisiones:
             estructurales_sin_dec = [
-                d for d in db.get_desvios(local=_local)
+                d for d in _get_desvios(_local)
                 if d.get("tipo_desvio") == "estructural"
-                and d["estado"] in ("pendiente", "en_proceso")
+                and d["estado"] in _ESTADOS_ACTIVOS
             ]
             if estructurales_sin_dec:
                 st.info("Hay desvíos estructurales sin decisión creada. Se crean automáticamente al cerrar un desvío estructural.")
                 for d in estructurales_sin_dec:
                     if st.button(f"Crear decisión para {d['item_codigo']}", key=f"creat_dec_{d['_id']}"):
                         db.create_decision(d["_id"], d["item_codigo"], d["local"], d.get("ai_justificacion", ""))
+                        _clear_desvio_caches()
                         st.rerun()
             else:
                 st.success("No hay decisiones pendientes.")
@@ -340,6 +425,7 @@ def _render_vista_ejecutiva():
                         "propuesta": propuesta,
                         "estado_decision": estado_dec,
                     })
+                    _clear_desvio_caches()
                     st.success(f"Decisión actualizada para {dec['item_codigo']}.")
                     st.rerun()
 
@@ -370,10 +456,7 @@ def _render_vista_ejecutiva():
 
                 st.divider()
                 st.subheader("Desvíos del período")
-                desvios_mes = [
-                    d for d in db.get_desvios(local=report_local)
-                    if d.get("auditoria_fecha") == mes_sel
-                ]
+                desvios_mes = _get_desvios_auditoria(report_local, mes_sel)
                 if desvios_mes:
                     rows = []
                     for d in desvios_mes:
@@ -385,13 +468,11 @@ def _render_vista_ejecutiva():
                             "Tipo": d.get("tipo_desvio", ""),
                             "Reincidente": "Sí" if d.get("reincidente") else "No",
                         })
-                    df_desv = pd.DataFrame(rows)
-                    st.dataframe(df_desv, use_container_width=True, hide_index=True)
+                    st.dataframe(rows, use_container_width=True, hide_index=True)
 
-                    csv = df_desv.to_csv(index=False).encode("utf-8")
                     st.download_button(
                         "Descargar reporte CSV",
-                        data=csv,
+                        data=_rows_to_csv(rows),
                         file_name=f"reporte_{report_local}_{mes_sel}.csv",
                         mime="text/csv",
                         use_container_width=True,
@@ -401,14 +482,14 @@ def _render_vista_ejecutiva():
 
                 st.divider()
                 st.subheader("Ítems reincidentes")
-                reinc = db.get_top_reincidentes(local=report_local, limit=5)
+                reinc = _get_top_reincidentes(report_local, 5)
                 if reinc:
                     for r in reinc:
                         st.markdown(f"- **{r['item_codigo']}**: {r['count']} veces detectado")
                 else:
                     st.success("Sin reincidencias.")
 
-                all_scores = db.get_monthly_scores(report_local, months=2)
+                all_scores = _get_monthly_scores(report_local, 2)
                 if len(all_scores) >= 2:
                     prev = all_scores[-2].get("score_global", 0)
                     curr = all_scores[-1].get("score_global", 0)
@@ -438,6 +519,17 @@ def _fmt_date(dt) -> str:
     return str(dt)
 
 
+def _rows_to_csv(rows: list[dict]) -> bytes:
+    """UTF-8 CSV (header + rows) written straight to bytes, without a DataFrame."""
+    buf = io.BytesIO()
+    text = io.TextIOWrapper(buf, encoding="utf-8", newline="")
+    writer = csv.DictWriter(text, fieldnames=list(rows[0]), lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    text.detach()
+    return buf.getvalue()
+
+
 # ══════════════════════════════════════════════════════════════════════════
 # Main
 # ══════════════════════════════════════════════════════════════════════════
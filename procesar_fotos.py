@@ -40,18 +40,33 @@ Estructura de salida:
 from __future__ import annotations
 
 import argparse
+import functools
+import io
 import os
-import re
 import shutil
+import subprocess
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-from PIL import Image
+from PIL import Image, ImageOps, features
 
 MAX_DIMENSION = 1200
 JPEG_QUALITY = 80
 VALID_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".heic", ".heif"}
+ENCODERS = ("pillow", "mozjpeg")
+# Submuestreo de croma (valor de Pillow): 0 = 4:4:4, 1 = 4:2:2, 2 = 4:2:0.
+# Para fotos de locales/productos 4:2:0 no pierde nada visible.
+CHROMA_SUBSAMPLING = 2
+_CJPEG_SAMPLE = {0: "1x1", 1: "2x1", 2: "2x2"}
+# Hasta esta cantidad de fotos se usan threads (Pillow libera el GIL al
+# decodificar/redimensionar/codificar) y no vale la pena arrancar procesos.
+THREAD_BATCH_MAX = 16
+# Las líneas de progreso se acumulan y se escriben juntas cada este intervalo (s).
+PROGRESS_FLUSH_SECS = 0.5
 
 SECTION_FOLDERS = {
     "A": "A_Infraestructura",
@@ -61,54 +76,174 @@ SECTION_FOLDERS = {
     "E": "E_Stock",
 }
 
-ITEM_PATTERN = re.compile(
-    r"^([A-Ea-e])(\d{1,2})",
-)
+_ASCII_DIGITS = frozenset("0123456789")
 
 
 def parse_item_code(filename: str) -> tuple[str, str] | None:
     """Extract section letter and item number from filename.
     Returns ('A', '1') for 'A1_foto.jpg' or None if no match.
     """
+    # Equivale a r"^([A-Ea-e])(\d{1,2})" con operaciones de string, sin regex.
     stem = Path(filename).stem
-    m = ITEM_PATTERN.match(stem)
-    if m:
-        return m.group(1).upper(), m.group(2)
-    return None
-
-
-def compress_image(src: Path, dst: Path, max_dim: int = MAX_DIMENSION, quality: int = JPEG_QUALITY):
-    """Resize and compress image to audit quality."""
+    section = stem[:1].upper()
+    if not section or section not in SECTION_FOLDERS:
+        return None
+    n = 1
+    while n < 3 and n < len(stem) and stem[n] in _ASCII_DIGITS:
+        n += 1
+    return (section, stem[1:n]) if n > 1 else None
+
+
+def _encode_mozjpeg(img: Image.Image, quality: int, exif: bytes | None, subsampling: int) -> bytes:
+    """Encode with mozjpeg's `cjpeg` (PPM via stdin), re-inserting EXIF as APP1."""
+    ppm = io.BytesIO()
+    img.save(ppm, "PPM")
+    data = subprocess.run(
+        ["cjpeg", "-quality", str(quality), "-optimize", "-progressive",
+         "-sample", _CJPEG_SAMPLE[subsampling]],
+        input=ppm.getvalue(),
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout
+    if exif and len(exif) + 2 <= 0xFFFF:
+        # cjpeg no copia metadatos: el segmento APP1 va justo después del SOI.
+        data = data[:2] + b"\xff\xe1" + (len(exif) + 2).to_bytes(2, "big") + exif + data[2:]
+    return data
+
+
+def _flatten_to_jpeg_mode(img: Image.Image) -> Image.Image:
+    """Return an image JPEG can encode, compositing transparency onto white."""
+    if img.mode == "P":
+        img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+    if img.mode in ("RGBA", "LA"):
+        bg = Image.new("RGB", img.size, (255, 255, 255))
+        bg.paste(img, mask=img.getchannel("A"))
+        return bg
+    if img.mode not in ("RGB", "L", "CMYK"):
+        return img.convert("RGB")
+    return img
+
+
+def _copy_as_is(src: Path, dst: Path) -> int:
+    """Copy `src` to `dst` (with metadata) and return its size.
+
+    On Linux, copy_file_range keeps the copy in the kernel and is a reflink on
+    btrfs/XFS; elsewhere (or if it fails) it falls back to shutil.copy2.
+    """
+    size = src.stat().st_size
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                copied = 0
+                while copied < size:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+                    if n == 0:
+                        break
+                    copied += n
+            if copied == size:
+                shutil.copystat(src, dst)
+                return size
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    return size
+
+
+def compress_image(
+    src: Path,
+    dst: Path,
+    max_dim: int = MAX_DIMENSION,
+    quality: int = JPEG_QUALITY,
+    encoder: str = "pillow",
+    jxl: bool = False,
+    keep_exif: bool = False,
+    subsampling: int = CHROMA_SUBSAMPLING,
+) -> tuple[Path, int]:
+    """Resize and compress image to audit quality. Returns (written path, size in bytes).
+
+    EXIF metadata (GPS, camera, etc.) is stripped unless `keep_exif`: the audit
+    doesn't need it, it takes space and it can leak personal data.
+    With `jxl`, the resulting JPEG is recompressed losslessly into JPEG XL
+    (`djxl` restores the exact same JPEG) and the `.jxl` path is returned.
+    Files Pillow can't open are copied as-is.
+    """
     try:
-        img = Image.open(src)
+        src_img = Image.open(src)
     except Exception:
-        shutil.copy2(src, dst)
-        return None
+        return dst, _copy_as_is(src, dst)
+
+    # El archivo fuente (y su buffer) se libera al salir del with, incluso si
+    # algo falla: menos RAM por worker, permite subir --jobs en VMs chicas.
+    with src_img:
+        img = src_img
+        # Para JPEG, libjpeg puede decodificar directo a 1/2, 1/4 u 1/8 de la
+        # resolución (escalado en el dominio DCT) sin bajar de max_dim; el
+        # thumbnail de abajo hace el ajuste fino sobre una imagen mucho más chica.
+        if img.format == "JPEG":
+            img.draft("RGB", (max_dim, max_dim))
+
+        # Aplicar la rotación EXIF a los píxeles: sin esto, al descartar el EXIF
+        # las fotos verticales del celular quedan acostadas. exif_transpose también
+        # borra el tag Orientation del EXIF que se conserva con --keep-exif.
+        img = ImageOps.exif_transpose(img)
+
+        if img.mode != "RGB":  # las fotos del celular ya vienen en RGB
+            img = _flatten_to_jpeg_mode(img)
+
+        exif = None
+        if keep_exif:
+            try:
+                exif_data = img.info.get("exif")
+                if exif_data:
+                    exif = exif_data
+            except Exception:
+                pass
+
+        # reduce() por bloques hasta ~3× el tamaño final y LANCZOS solo para el
+        # último tramo; solo achica y mantiene la proporción.
+        img.thumbnail((max_dim, max_dim), Image.LANCZOS, reducing_gap=3.0)
+
+        # Se codifica en memoria: el tamaño sale de len(data), sin stat() posterior.
+        if encoder == "mozjpeg" and img.mode in ("RGB", "L"):
+            data = _encode_mozjpeg(img, quality, exif, subsampling)
+        else:
+            # Progresivo + tablas Huffman optimizadas: 2-8% más chico a igual calidad.
+            save_kwargs = {
+                "quality": quality,
+                "optimize": True,
+                "progressive": True,
+                "subsampling": subsampling,
+            }
+            if exif:
+                save_kwargs["exif"] = exif
+            buf = io.BytesIO()
+            img.save(buf, "JPEG", **save_kwargs)
+            data = buf.getvalue()
 
-    if img.mode in ("RGBA", "P"):
-        img = img.convert("RGB")
+    dst = dst.with_suffix(".jpg")
+    dst.write_bytes(data)
 
-    exif = None
-    try:
-        exif_data = img.info.get("exif")
-        if exif_data:
-            exif = exif_data
-    except Exception:
-        pass
+    if jxl:
+        jxl_dst = dst.with_suffix(".jxl")
+        subprocess.run(
+            ["cjxl", "--lossless_jpeg=1", "--quiet", str(dst), str(jxl_dst)],
+            check=True,
+        )
+        dst.unlink()
+        return jxl_dst, jxl_dst.stat().st_size
+    return dst, len(data)
 
-    w, h = img.size
-    if max(w, h) > max_dim:
-        ratio = max_dim / max(w, h)
-        new_size = (int(w * ratio), int(h * ratio))
-        img = img.resize(new_size, Image.LANCZOS)
 
-    save_kwargs = {"quality": quality, "optimize": True}
-    if exif:
-        save_kwargs["exif"] = exif
+def process_photo(paths: tuple[Path, Path], **options) -> tuple[int, int]:
+    """Compress one photo (worker entry point). Returns (original_size, compressed_size).
 
-    dst = dst.with_suffix(".jpg")
-    img.save(dst, "JPEG", **save_kwargs)
-    return dst
+    `options` are the batch-wide `compress_image` keyword arguments, bound once
+    with functools.partial in `main`.
+    """
+    src_file, dst_file = paths
+    original_size = src_file.stat().st_size
+    _, compressed_size = compress_image(src_file, dst_file, **options)
+    return original_size, compressed_size
 
 
 def format_size(size_bytes: int) -> str:
@@ -157,6 +292,37 @@ def main():
         default=JPEG_QUALITY,
         help=f"Calidad JPEG 1-100 (default: {JPEG_QUALITY})",
     )
+    parser.add_argument(
+        "--subsampling",
+        type=int,
+        choices=sorted(_CJPEG_SAMPLE),
+        default=CHROMA_SUBSAMPLING,
+        help="Submuestreo de croma: 0=4:4:4, 1=4:2:2, 2=4:2:0 (default: 2)",
+    )
+    parser.add_argument(
+        "--encoder",
+        choices=ENCODERS,
+        default="pillow",
+        help="Codificador JPEG: pillow (libjpeg-turbo) o mozjpeg (~20%% más chico, "
+        "más lento; requiere `cjpeg` de mozjpeg en el PATH)",
+    )
+    parser.add_argument(
+        "--jxl",
+        action="store_true",
+        help="Recomprimir cada JPEG sin pérdida a JPEG XL (.jxl, ~20%% más chico; "
+        "requiere `cjxl` en el PATH, `djxl` recupera el JPEG exacto)",
+    )
+    parser.add_argument(
+        "--keep-exif",
+        action="store_true",
+        help="Conservar los metadatos EXIF (por defecto se descartan: privacidad y espacio)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Procesos en paralelo para comprimir (default: núcleos de la CPU)",
+    )
 
     args = parser.parse_args()
 
@@ -164,24 +330,33 @@ def main():
     if not entrada.is_dir():
         print(f"Error: '{entrada}' no es una carpeta válida.")
         sys.exit(1)
+    if args.encoder == "mozjpeg" and not shutil.which("cjpeg"):
+        print("Error: --encoder mozjpeg requiere `cjpeg` (mozjpeg) en el PATH.")
+        sys.exit(1)
+    if args.jxl and not shutil.which("cjxl"):
+        print("Error: --jxl requiere `cjxl` (libjxl) en el PATH.")
+        sys.exit(1)
 
     local_slug = args.local.replace(" ", "-")
     audit_folder_name = f"{args.fecha}_{local_slug}"
     base_salida = Path(args.salida) / audit_folder_name
     sin_clasificar = base_salida / "sin_clasificar"
 
-    for folder in SECTION_FOLDERS.values():
-        (base_salida / folder).mkdir(parents=True, exist_ok=True)
+    section_dirs = {sec: base_salida / folder for sec, folder in SECTION_FOLDERS.items()}
+    for section_dir in section_dirs.values():
+        section_dir.mkdir(parents=True, exist_ok=True)
     sin_clasificar.mkdir(parents=True, exist_ok=True)
 
     max_dim = args.max_px
     jpeg_q = args.calidad
 
-    all_files = []
-    for ext in VALID_EXTENSIONS:
-        all_files.extend(entrada.rglob(f"*{ext}"))
-        all_files.extend(entrada.rglob(f"*{ext.upper()}"))
-    all_files = sorted(set(all_files))
+    # Un solo recorrido del árbol (en vez de un rglob por extensión y por caso).
+    all_files = sorted(
+        Path(root) / name
+        for root, _dirs, names in os.walk(entrada)
+        for name in names
+        if os.path.splitext(name)[1].lower() in VALID_EXTENSIONS
+    )
 
     if not all_files:
         print(f"No se encontraron fotos en '{entrada}'.")
@@ -197,6 +372,16 @@ def main():
     print(f"  Fotos:      {len(all_files)} encontradas")
     print(f"  Resolución: {args.max_px}px máximo")
     print(f"  Calidad:    {args.calidad}%")
+    # Los wheels oficiales de Pillow traen libjpeg-turbo (SIMD); un build contra
+    # libjpeg "a secas" comprime varias veces más lento.
+    if args.encoder == "mozjpeg":
+        print("  JPEG:       mozjpeg (cjpeg)")
+    elif features.check_feature("libjpeg_turbo"):
+        print(f"  JPEG:       libjpeg-turbo {features.version_feature('libjpeg_turbo')}")
+    else:
+        print("  JPEG:       libjpeg sin turbo (reinstalar Pillow desde wheel oficial)")
+    if args.jxl:
+        print("  Formato:    JPEG XL (recompresión sin pérdida)")
     print(f"  Salida:     {base_salida}")
     print(f"{'='*60}\n")
 
@@ -204,46 +389,70 @@ def main():
     total_compressed = 0
     classified = 0
     unclassified = 0
-    items_found: dict[str, int] = {}
-
-    for i, src_file in enumerate(all_files, 1):
-        original_size = src_file.stat().st_size
-        total_original += original_size
+    items_found: Counter[str] = Counter()
 
+    # Clasificación y carpetas antes de repartir (sin carreras en mkdir);
+    # la compresión, que es lo caro, va a un pool de threads o de procesos.
+    tasks = []
+    item_folders: dict[str, Path] = {}  # un solo mkdir por ítem, no uno por foto
+    for src_file in all_files:
         parsed = parse_item_code(src_file.name)
 
         if parsed:
             section, item_num = parsed
             item_code = f"{section}{item_num}"
-            section_folder = SECTION_FOLDERS.get(section, "sin_clasificar")
-            item_folder = base_salida / section_folder / item_code
-            item_folder.mkdir(parents=True, exist_ok=True)
+            item_folder = item_folders.get(item_code)
+            if item_folder is None:
+                # parse_item_code solo devuelve secciones de SECTION_FOLDERS.
+                item_folder = section_dirs[section] / item_code
+                item_folder.mkdir(exist_ok=True)
+                item_folders[item_code] = item_folder
 
             dst_file = item_folder / src_file.name
-            result_path = compress_image(src_file, dst_file, max_dim, jpeg_q)
-
-            items_found[item_code] = items_found.get(item_code, 0) + 1
+            items_found[item_code] += 1
             classified += 1
         else:
             dst_file = sin_clasificar / src_file.name
-            result_path = compress_image(src_file, dst_file, max_dim, jpeg_q)
             unclassified += 1
-
-        if result_path and result_path.exists():
-            compressed_size = result_path.stat().st_size
-        else:
-            compressed_size = dst_file.stat().st_size if dst_file.exists() else original_size
-        total_compressed += compressed_size
-
-        pct = i / len(all_files) * 100
-        print(
-            f"  [{pct:5.1f}%] {src_file.name:40s} "
-            f"{format_size(original_size):>8s} → {format_size(compressed_size):>8s}"
-        )
+        tasks.append((src_file, dst_file))
+
+    # Las opciones son iguales para todo el lote: se fijan una vez, no por foto.
+    worker = functools.partial(
+        process_photo,
+        max_dim=max_dim,
+        quality=jpeg_q,
+        encoder=args.encoder,
+        jxl=args.jxl,
+        keep_exif=args.keep_exif,
+        subsampling=args.subsampling,
+    )
+    pool_cls = ThreadPoolExecutor if len(tasks) <= THREAD_BATCH_MAX else ProcessPoolExecutor
+    progress: list[str] = []
+    next_flush = time.monotonic() + PROGRESS_FLUSH_SECS
+    with pool_cls(max_workers=max(1, args.jobs)) as ex:
+        results = ex.map(worker, tasks, chunksize=4)
+        for i, (src_file, (original_size, compressed_size)) in enumerate(zip(all_files, results), 1):
+            total_original += original_size
+            total_compressed += compressed_size
+
+            pct = i / len(all_files) * 100
+            progress.append(
+                f"  [{pct:5.1f}%] {src_file.name:40s} "
+                f"{format_size(original_size):>8s} → {format_size(compressed_size):>8s}\n"
+            )
+            if time.monotonic() >= next_flush or i == len(all_files):
+                sys.stdout.write("".join(progress))
+                sys.stdout.flush()
+                progress.clear()
+                next_flush = time.monotonic() + PROGRESS_FLUSH_SECS
 
     savings = total_original - total_compressed
     savings_pct = (savings / total_original * 100) if total_original else 0
 
+    format_lines = [
+        "FORMATO: JPEG XL (.jxl) — `djxl foto.jxl foto.jpg` recupera el JPEG original.",
+        "",
+    ] if args.jxl else []
     summary_lines = [
         f"AUDITORÍA: {args.local} — {args.fecha}",
         f"Procesado: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
@@ -257,10 +466,11 @@ def main():
         f"  Comprimido:  {format_size(total_compressed)}",
         f"  Ahorro:      {format_size(savings)} ({savings_pct:.0f}%)",
         "",
+        *format_lines,
         f"ÍTEMS CON FOTOS ({len(items_found)}):",
     ]
-    for code in sorted(items_found.keys(), key=lambda x: (x[0], int(x[1:]))):
-        summary_lines.append(f"  {code}: {items_found[code]} fotos")
+    for code, count in sorted(items_found.items(), key=lambda kv: (kv[0][0], int(kv[0][1:]))):
+        summary_lines.append(f"  {code}: {count} fotos")
 
     if unclassified:
         summary_lines.extend([